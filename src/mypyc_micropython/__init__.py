@@ -1,4 +1,19 @@
-from mypyc_micropython.compiler import compile_source, compile_to_micropython
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mypyc_micropython.compiler import compile_source, compile_to_micropython
 
 __version__ = "0.1.0"
 __all__ = ["compile_source", "compile_to_micropython"]
+
+
+def __getattr__(name: str) -> Any:
+    # The compiler pulls in mypy; load it on first use so that importing a
+    # submodule (e.g. the CLI for --help) stays cheap.
+    if name in __all__:
+        from mypyc_micropython import compiler
+
+        return getattr(compiler, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
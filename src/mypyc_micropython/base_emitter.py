@@ -7,6 +7,7 @@ used by both FunctionEmitter and MethodEmitter.
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import assert_never
 
@@ -72,49 +73,59 @@ from .ir import (
     WhileIR,
 )
 
-C_RESERVED_WORDS = {
-    "auto",
-    "break",
-    "case",
-    "char",
-    "const",
-    "continue",
-    "default",
-    "do",
-    "double",
-    "else",
-    "enum",
-    "extern",
-    "float",
-    "for",
-    "goto",
-    "if",
-    "int",
-    "long",
-    "register",
-    "return",
-    "short",
-    "signed",
-    "sizeof",
-    "static",
-    "struct",
-    "switch",
-    "typedef",
-    "union",
-    "unsigned",
-    "void",
-    "volatile",
-    "while",
-    "inline",
-    "restrict",
-    "_Bool",
-    "_Complex",
-    "_Imaginary",
-}
+C_RESERVED_WORDS = frozenset(
+    {
+        "auto",
+        "break",
+        "case",
+        "char",
+        "const",
+        "continue",
+        "default",
+        "do",
+        "double",
+        "else",
+        "enum",
+        "extern",
+        "float",
+        "for",
+        "goto",
+        "if",
+        "int",
+        "long",
+        "register",
+        "return",
+        "short",
+        "signed",
+        "sizeof",
+        "static",
+        "struct",
+        "switch",
+        "typedef",
+        "union",
+        "unsigned",
+        "void",
+        "volatile",
+        "while",
+        "inline",
+        "restrict",
+        "_Bool",
+        "_Complex",
+        "_Imaginary",
+    }
+)
+
 
+_NON_IDENT_RE = re.compile(r"[^a-zA-Z0-9_]")
 
+
+# Called for every identifier the emitters touch, over a small set of names
+@functools.lru_cache(maxsize=4096)
 def sanitize_name(name: str) -> str:
-    result = re.sub(r"[^a-zA-Z0-9_]", "_", name)
+    # Most names are already plain ASCII identifiers; skip the regex for them
+    if name.isascii() and name.isidentifier() and name not in C_RESERVED_WORDS:
+        return name
+    result = _NON_IDENT_RE.sub("_", name)
     if result and result[0].isdigit():
         result = "_" + result
     if result in C_RESERVED_WORDS:
@@ -430,6 +441,9 @@ class BaseEmitter:
 
     def _emit_raise(self, stmt: RaiseIR, native: bool = False) -> list[str]:
         del native
+        if stmt.as_stop_iteration_sentinel:
+            return ["    return MP_OBJ_STOP_ITERATION;"]
+
         lines = self._emit_prelude(stmt.prelude)
 
         if stmt.is_reraise:
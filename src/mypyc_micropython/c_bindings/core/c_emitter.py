@@ -15,14 +15,57 @@ from mypyc_micropython.c_bindings.core.c_ir import (
     CTypeDef,
 )
 
+_NON_IDENT_CHAR = re.compile(r"[^A-Za-z0-9]")
+
+# Library-independent pointer wrapper emitted at the top of every binding;
+# built once at import instead of on each emit().
+PTR_WRAPPER_TYPE_LINES: tuple[str, ...] = (
+    "#ifndef MP_C_PTR_T_DEFINED",
+    "#define MP_C_PTR_T_DEFINED",
+    "typedef struct {",
+    "    mp_obj_base_t base;",
+    "    void *ptr;",
+    "} mp_c_ptr_t;",
+    "#endif",
+    "",
+    "static MP_DEFINE_CONST_OBJ_TYPE(",
+    "    mp_type_c_ptr,",
+    "    MP_QSTR_c_ptr,",
+    "    MP_TYPE_FLAG_NONE",
+    ");",
+    "",
+    "static inline mp_obj_t wrap_ptr(void *ptr) {",
+    "    if (ptr == NULL) return mp_const_none;",
+    "    mp_c_ptr_t *o = mp_obj_malloc(mp_c_ptr_t, &mp_type_c_ptr);",
+    "    o->ptr = ptr;",
+    "    return MP_OBJ_FROM_PTR(o);",
+    "}",
+    "",
+    "static inline void *unwrap_ptr(mp_obj_t obj) {",
+    "    if (obj == mp_const_none) return NULL;",
+    "    mp_c_ptr_t *o = MP_OBJ_TO_PTR(obj);",
+    "    return o->ptr;",
+    "}",
+    "",
+)
+
 
 class CEmitter:
     def __init__(self, library: CLibraryDef, emit_public: bool = False) -> None:
         self.lib = library
         self.emit_public = emit_public
         self.lines: list[str] = []
+        self._wrapped_funcs: tuple[CFuncDef, ...] = ()
+
+    def _snapshot_functions(self) -> None:
+        # The library is read-only once parsed; snapshot the functions that
+        # get wrappers so each emit pass walks a tuple without re-filtering.
+        self._wrapped_funcs = tuple(
+            func for func in self.lib.functions.values() if not func.has_var_args
+        )
 
     def emit(self) -> str:
+        self._snapshot_functions()
         self._emit_header()
         self._emit_ptr_wrapper_type()
         self._emit_struct_types()
@@ -39,10 +82,8 @@ class CEmitter:
             '#include "py/obj.h"',
         ]
 
-        for func in self.lib.functions.values():
-            if func.has_var_args:
-                continue
-            lines.append(self._make_wrapper_extern_decl(func))
+        self._snapshot_functions()
+        lines.extend(self._make_wrapper_extern_decl(func) for func in self._wrapped_funcs)
 
         lines.append("#endif")
         return "\n".join(lines)
@@ -61,37 +102,7 @@ class CEmitter:
         self.lines.append("")
 
     def _emit_ptr_wrapper_type(self) -> None:
-        self.lines.extend(
-            [
-                "#ifndef MP_C_PTR_T_DEFINED",
-                "#define MP_C_PTR_T_DEFINED",
-                "typedef struct {",
-                "    mp_obj_base_t base;",
-                "    void *ptr;",
-                "} mp_c_ptr_t;",
-                "#endif",
-                "",
-                "static MP_DEFINE_CONST_OBJ_TYPE(",
-                "    mp_type_c_ptr,",
-                "    MP_QSTR_c_ptr,",
-                "    MP_TYPE_FLAG_NONE",
-                ");",
-                "",
-                "static inline mp_obj_t wrap_ptr(void *ptr) {",
-                "    if (ptr == NULL) return mp_const_none;",
-                "    mp_c_ptr_t *o = mp_obj_malloc(mp_c_ptr_t, &mp_type_c_ptr);",
-                "    o->ptr = ptr;",
-                "    return MP_OBJ_FROM_PTR(o);",
-                "}",
-                "",
-                "static inline void *unwrap_ptr(mp_obj_t obj) {",
-                "    if (obj == mp_const_none) return NULL;",
-                "    mp_c_ptr_t *o = MP_OBJ_TO_PTR(obj);",
-                "    return o->ptr;",
-                "}",
-                "",
-            ]
-        )
+        self.lines.extend(PTR_WRAPPER_TYPE_LINES)
 
     def _emit_struct_types(self) -> None:
         for struct in self.lib.structs.values():
@@ -177,9 +188,7 @@ class CEmitter:
         )
 
     def _emit_wrappers(self) -> None:
-        for func in self.lib.functions.values():
-            if func.has_var_args:
-                continue
+        for func in self._wrapped_funcs:
             has_callback = any(p.type_def.base_type == CType.CALLBACK for p in func.params)
             if has_callback:
                 self._emit_callback_wrapper(func)
@@ -460,7 +469,7 @@ class CEmitter:
         return "" if self.emit_public else "static "
 
     def _header_guard_name(self) -> str:
-        upper = re.sub(r"[^A-Za-z0-9]", "_", self.lib.name).upper()
+        upper = _NON_IDENT_CHAR.sub("_", self.lib.name).upper()
         return f"{upper}_WRAPPERS_H"
 
     def _make_wrapper_extern_decl(self, func: CFuncDef) -> str:
@@ -492,9 +501,7 @@ class CEmitter:
         self.lines.append(f"static const mp_rom_map_elem_t {name}_module_globals_table[] = {{")
         self.lines.append(f"    {{ MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_{name}) }},")
 
-        for func in self.lib.functions.values():
-            if func.has_var_args:
-                continue
+        for func in self._wrapped_funcs:
             self.lines.append(
                 f"    {{ MP_ROM_QSTR(MP_QSTR_{func.py_name}), MP_ROM_PTR(&{func.c_name}_obj) }},"
             )
@@ -88,15 +88,19 @@ class CType(Enum):
         return mapping.get(self, f"ptr_to_mp({val_expr})")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CTypeDef:
-    """Type definition with optional struct reference."""
+    """Type definition with optional struct reference.
+
+    Frozen so the stub parser can share one instance per primitive type.
+    """
+
     base_type: CType
     struct_name: str | None = None
     callback_name: str | None = None
     is_optional: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class CStructDef:
     py_name: str
     c_name: str
@@ -105,7 +109,7 @@ class CStructDef:
     docstring: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CEnumDef:
     py_name: str
     c_name: str
@@ -113,13 +117,13 @@ class CEnumDef:
     docstring: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CParamDef:
     name: str
     type_def: CTypeDef
 
 
-@dataclass
+@dataclass(slots=True)
 class CFuncDef:
     py_name: str
     c_name: str
@@ -129,14 +133,14 @@ class CFuncDef:
     has_var_args: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class CCallbackDef:
     py_name: str
     params: list[CParamDef] = field(default_factory=list)
     return_type: CTypeDef = field(default_factory=lambda: CTypeDef(CType.VOID))
     user_data_param: int | None = None
 
-@dataclass
+@dataclass(slots=True)
 class CLibraryDef:
     """Complete C library definition parsed from a .pyi stub."""
 
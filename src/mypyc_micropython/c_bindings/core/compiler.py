@@ -8,7 +8,7 @@ from mypyc_micropython.c_bindings.core.cmake_emitter import CMakeEmitter
 from mypyc_micropython.c_bindings.core.stub_parser import StubParser
 
 
-@dataclass
+@dataclass(slots=True)
 class CompilationResult:
     success: bool
     c_code: str = ""
@@ -96,8 +96,17 @@ class CBindingCompiler:
     ) -> None:
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        c_path = output_dir / f"{module_name}.c"
-        c_path.write_text(c_code)
+        self._write_if_changed(output_dir / f"{module_name}.c", c_code)
+        self._write_if_changed(output_dir / "micropython.cmake", cmake_code)
 
-        cmake_path = output_dir / "micropython.cmake"
-        cmake_path.write_text(cmake_code)
+    @staticmethod
+    def _write_if_changed(path: Path, text: str) -> None:
+        # Leave identical files untouched so their mtime stays put and the
+        # firmware build does not recompile bindings that did not change.
+        data = text.encode("utf-8")
+        try:
+            if path.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            pass
+        path.write_bytes(data)
@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import ast
+import dataclasses
+import inspect
+import operator
+from collections.abc import Callable
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 from mypyc_micropython.c_bindings.core.c_ir import (
     CCallbackDef,
@@ -40,34 +44,85 @@ PRIMITIVE_TYPE_MAP: dict[str, CType] = {
     "None": CType.VOID,
 }
 
+# Shared flyweights: CTypeDef is frozen, so every `c_int` annotation can
+# resolve to the same instance instead of allocating a fresh one.
+PRIMITIVE_TYPEDEFS: dict[str, CTypeDef] = {
+    name: CTypeDef(base_type=ctype) for name, ctype in PRIMITIVE_TYPE_MAP.items()
+}
+VOID_PTR_TYPEDEF = CTypeDef(base_type=CType.PTR)
+
+CONST_BINOPS: dict[type[ast.operator], Callable[[int, int], int]] = {
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitOr: operator.or_,
+    ast.BitAnd: operator.and_,
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+}
+
+
+def _docstring(node: ast.Module | ast.ClassDef | ast.FunctionDef) -> str | None:
+    """ast.get_docstring without its per-call type checks.
+
+    Most stub bodies are a bare `...`, so bail out before cleandoc unless the
+    first statement really is a string literal.
+    """
+    body = node.body
+    if not body:
+        return None
+    first = body[0]
+    if type(first) is not ast.Expr:
+        return None
+    value = first.value
+    if type(value) is not ast.Constant or type(value.value) is not str:
+        return None
+    return inspect.cleandoc(value.value)
+
 
 class StubParser:
     """Parse .pyi stub files into CLibraryDef."""
 
     def __init__(self) -> None:
         self._library: CLibraryDef | None = None
+        # Per-parse caches for annotations whose meaning does not depend on
+        # what has been declared so far (bare names do, so they are not cached).
+        self._pointer_typedefs: dict[str, CTypeDef] = {}
+        self._optional_typedefs: dict[CTypeDef, CTypeDef] = {}
+        self._class_decorators: dict[str, Callable[[ast.ClassDef, ast.Call], None]] = {
+            "c_struct": self._parse_struct,
+            "c_enum": self._parse_enum,
+        }
+        self._statement_handlers: dict[type[ast.stmt], Callable[[Any], None]] = {
+            ast.Assign: self._parse_assign,
+            ast.AnnAssign: self._parse_module_constant,
+            ast.ClassDef: self._parse_class,
+            ast.FunctionDef: self._parse_function,
+        }
 
     def parse_file(self, path: Path) -> CLibraryDef:
-        source = path.read_text()
-        return self.parse_source(source, path.stem)
+        # ast.parse decodes bytes itself (honouring any PEP 263 cookie),
+        # so skip the separate read_text() decode pass.
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+        return self._parse_tree(tree, path.stem)
 
     def parse_source(self, source: str, name: str = "module") -> CLibraryDef:
+        return self._parse_tree(ast.parse(source), name)
+
+    def _parse_tree(self, tree: ast.Module, name: str) -> CLibraryDef:
         self._library = CLibraryDef(name=name)
-        tree = ast.parse(source)
+        self._pointer_typedefs = {}
+        self._optional_typedefs = {}
 
-        module_docstring = ast.get_docstring(tree)
+        module_docstring = _docstring(tree)
         if module_docstring:
             self._library.docstring = module_docstring
 
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.Assign):
-                self._parse_assign(node)
-            elif isinstance(node, ast.AnnAssign):
-                self._parse_module_constant(node)
-            elif isinstance(node, ast.ClassDef):
-                self._parse_class(node)
-            elif isinstance(node, ast.FunctionDef):
-                self._parse_function(node)
+        handlers = self._statement_handlers
+        for node in tree.body:
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(node)
         return self._library
 
     def _parse_assign(self, node: ast.Assign) -> None:
@@ -130,10 +185,10 @@ class StubParser:
             return callback
         params_node, return_node = subscript.slice.elts
         if isinstance(params_node, ast.List):
-            for i, param_ann in enumerate(params_node.elts):
-                type_def = self._parse_annotation(param_ann)
-                callback.params.append(CParamDef(name=f"arg{i}", type_def=type_def))
-
+            callback.params = [
+                CParamDef(name=f"arg{i}", type_def=self._parse_annotation(param_ann))
+                for i, param_ann in enumerate(params_node.elts)
+            ]
 
         callback.return_type = self._parse_annotation(return_node)
         # Auto-detect user_data parameter: first c_ptr[c_void] / void* param
@@ -147,11 +202,9 @@ class StubParser:
     def _parse_class(self, node: ast.ClassDef) -> None:
         for decorator in node.decorator_list:
             if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Name):
-                if decorator.func.id == "c_struct":
-                    self._parse_struct(node, decorator)
-                    return
-                if decorator.func.id == "c_enum":
-                    self._parse_enum(node, decorator)
+                handler = self._class_decorators.get(decorator.func.id)
+                if handler is not None:
+                    handler(node, decorator)
                     return
 
     def _parse_struct(self, node: ast.ClassDef, decorator: ast.Call) -> None:
@@ -168,15 +221,17 @@ class StubParser:
             py_name=node.name,
             c_name=c_name,
             is_opaque=is_opaque,
-            docstring=ast.get_docstring(node),
+            docstring=_docstring(node),
         )
 
         if not is_opaque:
             for item in node.body:
-                if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                    field_name = item.target.id
-                    field_type = self._parse_annotation(item.annotation)
-                    struct_def.fields[field_name] = field_type
+                if type(item) is not ast.AnnAssign:
+                    continue
+                target = item.target
+                if type(target) is not ast.Name:
+                    continue
+                struct_def.fields[target.id] = self._parse_annotation(item.annotation)
 
         assert self._library is not None
         self._library.structs[node.name] = struct_def
@@ -189,44 +244,71 @@ class StubParser:
         enum_def = CEnumDef(
             py_name=node.name,
             c_name=c_name,
-            docstring=ast.get_docstring(node),
+            docstring=_docstring(node),
         )
 
         for item in node.body:
-            if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                val_name = item.target.id
-                if item.value and isinstance(item.value, ast.Constant):
-                    enum_def.values[val_name] = cast(int, item.value.value)
-                elif item.value and isinstance(item.value, ast.BinOp):
-                    try:
-                        enum_def.values[val_name] = self._eval_const_expr(item.value)
-                    except (ValueError, TypeError):
-                        pass
+            # ast node classes are never subclassed, so exact type checks are
+            # safe and skip isinstance's MRO walk on large enum bodies.
+            if type(item) is not ast.AnnAssign:
+                continue
+            target = item.target
+            if type(target) is not ast.Name:
+                continue
+            value = item.value
+            if type(value) is ast.Constant:
+                enum_def.values[target.id] = cast(int, value.value)
+            elif (
+                type(value) is ast.UnaryOp
+                and type(value.op) is ast.USub
+                and type(value.operand) is ast.Constant
+            ):
+                # Negative literal such as -1
+                enum_def.values[target.id] = -cast(int, value.operand.value)
+            elif type(value) is ast.BinOp:
+                try:
+                    enum_def.values[target.id] = self._eval_const_expr(value)
+                except (ValueError, TypeError):
+                    pass
 
         assert self._library is not None
         self._library.enums[node.name] = enum_def
 
     def _eval_const_expr(self, node: ast.expr) -> int:
-        if isinstance(node, ast.Constant) and isinstance(node.value, int):
-            return node.value
-        if isinstance(node, ast.BinOp):
-            left = self._eval_const_expr(node.left)
-            right = self._eval_const_expr(node.right)
-            if isinstance(node.op, ast.LShift):
-                return left << right
-            if isinstance(node.op, ast.RShift):
-                return left >> right
-            if isinstance(node.op, ast.BitOr):
-                return left | right
-            if isinstance(node.op, ast.BitAnd):
-                return left & right
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
-            if isinstance(node.op, ast.Mult):
-                return left * right
-        raise ValueError(f"Cannot evaluate: {ast.dump(node)}")
+        # Post-order walk with an explicit stack: long flag chains such as
+        # (1 << 0) | (1 << 1) | ... nest one BinOp per term.
+        values: list[int] = []
+        stack: list[tuple[ast.expr, bool]] = [(node, False)]
+        while stack:
+            current, operands_ready = stack.pop()
+            if isinstance(current, ast.BinOp):
+                op = CONST_BINOPS.get(type(current.op))
+                if op is None:
+                    raise ValueError(f"Cannot evaluate: {ast.dump(current)}")
+                if operands_ready:
+                    right = values.pop()
+                    left = values.pop()
+                    values.append(op(left, right))
+                    continue
+                left_node = current.left
+                right_node = current.right
+                if (
+                    type(left_node) is ast.Constant
+                    and type(right_node) is ast.Constant
+                    and type(left_node.value) is int
+                    and type(right_node.value) is int
+                ):
+                    # Leaf pair such as `1 << 4`: no need to go through the stack
+                    values.append(op(left_node.value, right_node.value))
+                else:
+                    stack.append((current, True))
+                    stack.append((current.right, False))
+                    stack.append((current.left, False))
+            elif isinstance(current, ast.Constant) and isinstance(current.value, int):
+                values.append(current.value)
+            else:
+                raise ValueError(f"Cannot evaluate: {ast.dump(current)}")
+        return values[0]
 
     def _parse_function(self, node: ast.FunctionDef) -> None:
         assert self._library is not None
@@ -235,16 +317,14 @@ class StubParser:
         func_def = CFuncDef(
             py_name=node.name,
             c_name=node.name,
-            docstring=ast.get_docstring(node),
+            docstring=_docstring(node),
         )
 
-        for arg in node.args.args:
-            if arg.annotation:
-                param = CParamDef(
-                    name=arg.arg,
-                    type_def=self._parse_annotation(arg.annotation),
-                )
-                func_def.params.append(param)
+        func_def.params = [
+            CParamDef(name=arg.arg, type_def=self._parse_annotation(arg.annotation))
+            for arg in node.args.args
+            if arg.annotation
+        ]
 
         if node.args.vararg is not None:
             func_def.has_var_args = True
@@ -257,15 +337,17 @@ class StubParser:
     def _parse_annotation(self, annotation: ast.expr) -> CTypeDef:
         if isinstance(annotation, ast.Name):
             name = annotation.id
-            if name in PRIMITIVE_TYPE_MAP:
-                return CTypeDef(base_type=PRIMITIVE_TYPE_MAP[name])
-            # Check if name matches a known callback alias
-            if self._library and name in self._library.callbacks:
-                return CTypeDef(base_type=CType.CALLBACK, callback_name=name)
-            # Check if name matches a known struct - use STRUCT_VAL for non-opaque
-            if self._library and name in self._library.structs:
-                struct = self._library.structs[name]
-                if not struct.is_opaque:
+            primitive = PRIMITIVE_TYPEDEFS.get(name)
+            if primitive is not None:
+                return primitive
+            library = self._library
+            if library is not None:
+                # Check if name matches a known callback alias
+                if name in library.callbacks:
+                    return CTypeDef(base_type=CType.CALLBACK, callback_name=name)
+                # Check if name matches a known struct - use STRUCT_VAL for non-opaque
+                struct = library.structs.get(name)
+                if struct is not None and not struct.is_opaque:
                     return CTypeDef(base_type=CType.STRUCT_VAL, struct_name=name)
             return CTypeDef(base_type=CType.STRUCT_PTR, struct_name=name)
 
@@ -276,32 +358,32 @@ class StubParser:
                 if generic_name == "c_ptr":
                     if isinstance(annotation.slice, ast.Name):
                         slice_name = annotation.slice.id
-                        if slice_name in PRIMITIVE_TYPE_MAP:
-                            base = PRIMITIVE_TYPE_MAP[slice_name]
-                            if base == CType.VOID:
-                                return CTypeDef(base_type=CType.PTR)
-                        return CTypeDef(
-                            base_type=CType.STRUCT_PTR,
-                            struct_name=slice_name,
-                        )
+                        if PRIMITIVE_TYPE_MAP.get(slice_name) is CType.VOID:
+                            return VOID_PTR_TYPEDEF
+                        pointer = self._pointer_typedefs.get(slice_name)
+                        if pointer is None:
+                            pointer = CTypeDef(base_type=CType.STRUCT_PTR, struct_name=slice_name)
+                            self._pointer_typedefs[slice_name] = pointer
+                        return pointer
 
                 if generic_name == "Callable":
                     return CTypeDef(base_type=CType.CALLBACK)
 
-        if isinstance(annotation, ast.BinOp) and isinstance(annotation.op, ast.BitOr):
+        if isinstance(annotation, ast.BinOp) and type(annotation.op) is ast.BitOr:
             left = self._parse_annotation(annotation.left)
-            right_is_none = (
-                isinstance(annotation.right, ast.Constant) and annotation.right.value is None
-            ) or (isinstance(annotation.right, ast.Name) and annotation.right.id == "None")
-            if right_is_none:
-                left.is_optional = True
-                return left
+            right = annotation.right
+            if (type(right) is ast.Constant and right.value is None) or (
+                type(right) is ast.Name and right.id == "None"
+            ):
+                optional = self._optional_typedefs.get(left)
+                if optional is None:
+                    optional = dataclasses.replace(left, is_optional=True)
+                    self._optional_typedefs[left] = optional
+                return optional
+            # Other unions have no C equivalent; use the left operand's type
             return left
 
         if isinstance(annotation, ast.Constant) and annotation.value is None:
-            return CTypeDef(base_type=CType.VOID)
-
-        if isinstance(annotation, ast.Attribute):
-            return CTypeDef(base_type=CType.PTR)
+            return PRIMITIVE_TYPEDEFS["None"]
 
-        return CTypeDef(base_type=CType.PTR)
+        return VOID_PTR_TYPEDEF
@@ -7,8 +7,343 @@ including structs, vtables, constructors, and method wrappers.
 
 from __future__ import annotations
 
+import ast
+import dataclasses
+import functools
+import hashlib
+import io
+import os
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
 from .base_emitter import sanitize_name
-from .ir import ClassIR, CType, MethodIR, PropertyInfo
+from .ir import ClassIR, CType, DefaultArg, FieldIR, MethodIR, PropertyInfo
+
+# (field, C access path) pair as returned by ClassIR.get_all_fields_with_path()
+_FieldEntry = tuple[FieldIR, str]
+
+
+def _canonical_repr(obj: object, seen: dict[int, int]) -> str:
+    """Deterministic text form of an IR object graph, for class cache keys.
+
+    Unlike pickle, set members are sorted, so the result does not depend on
+    PYTHONHASHSEED. Dataclasses already visited (e.g. a base class shared by
+    several fields) are written as a back-reference.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return repr(obj)
+    if isinstance(obj, Enum):
+        return f"{type(obj).__qualname__}.{obj.name}"
+    if isinstance(obj, ast.AST):
+        return ast.dump(obj, include_attributes=True)
+    if isinstance(obj, (set, frozenset)):
+        return "{" + ",".join(sorted(_canonical_repr(item, seen) for item in obj)) + "}"
+    if isinstance(obj, dict):
+        items = (f"{_canonical_repr(k, seen)}:{_canonical_repr(v, seen)}" for k, v in obj.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(obj, (list, tuple)):
+        return (
+            f"{type(obj).__name__}(" + ",".join(_canonical_repr(item, seen) for item in obj) + ")"
+        )
+    if dataclasses.is_dataclass(obj):
+        ref = seen.get(id(obj))
+        if ref is not None:
+            return f"@{ref}"
+        seen[id(obj)] = len(seen)
+        parts = (
+            f"{f.name}={_canonical_repr(getattr(obj, f.name), seen)}"
+            for f in dataclasses.fields(obj)
+        )
+        return f"{type(obj).__qualname__}(" + ",".join(parts) + ")"
+    raise TypeError(f"cannot build a class cache key from {type(obj).__name__}")
+
+
+def _split_template(template: str, *names: str) -> tuple[str, ...]:
+    """Split a template at each {name}, in order, into its literal pieces.
+
+    Per-field loops join the pieces with an f-string, which is several times
+    faster than calling str.format on the template for every field.
+    """
+    pieces: list[str] = []
+    rest = template
+    for name in names:
+        head, sep, rest = rest.partition(f"{{{name}}}")
+        assert sep, f"{{{name}}} missing from {template!r}"
+        pieces.append(head)
+    pieces.append(rest)
+    return tuple(pieces)
+
+
+@dataclass(frozen=True)
+class _TypeCodegen:
+    """C fragments for one field or parameter CType, looked up once per field."""
+
+    default: str | None = None  # Value assigned to the field before __init__ runs
+    zero_init: bool = False  # Default is all zero bits, so a memset can clear it
+    is_obj: bool = False  # Stored boxed as mp_obj_t
+    box: str = "{expr}"  # Native value -> mp_obj_t
+    unbox: str = "{expr}"  # mp_obj_t -> native value
+    arg_kind: str = "MP_ARG_OBJ"  # mp_arg_t kind for a required argument
+    init_arg: str = "{arg}.u_obj"  # Parsed mp_arg_val_t -> __init__ wrapper argument
+    # Parsed mp_arg_val_t -> dataclass field value, pre-split by _split_template
+    dataclass_arg: tuple[str, ...] = ("", ".u_obj")
+    # printf conversion and pre-split argument for the dataclass __repr__; without
+    # one the field is boxed and printed with mp_obj_print_helper
+    repr_conv: str | None = None
+    repr_arg: tuple[str, ...] = ("", "")
+
+
+_OBJ_CODEGEN = _TypeCodegen(default="mp_const_none", is_obj=True)
+_TYPE_CODEGEN: dict[CType, _TypeCodegen] = {
+    CType.MP_OBJ_T: _OBJ_CODEGEN,
+    CType.GENERAL: _OBJ_CODEGEN,
+    CType.MP_INT_T: _TypeCodegen(
+        default="0",
+        zero_init=True,
+        box="mp_obj_new_int({expr})",
+        unbox="mp_obj_get_int({expr})",
+        arg_kind="MP_ARG_INT",
+        init_arg="mp_obj_new_int({arg}.u_int)",
+        dataclass_arg=_split_template("{arg}.u_int", "arg"),
+        repr_conv="%d",
+        repr_arg=_split_template("(int){slot}", "slot"),
+    ),
+    CType.MP_FLOAT_T: _TypeCodegen(
+        default="0.0",
+        zero_init=True,
+        box="mp_obj_new_float({expr})",
+        unbox="mp_obj_get_float({expr})",
+        dataclass_arg=_split_template("mp_obj_get_float({arg}.u_obj)", "arg"),
+    ),
+    CType.BOOL: _TypeCodegen(
+        default="false",
+        zero_init=True,
+        box="{expr} ? mp_const_true : mp_const_false",
+        unbox="mp_obj_is_true({expr})",
+        arg_kind="MP_ARG_BOOL",
+        init_arg="{arg}.u_bool ? mp_const_true : mp_const_false",
+        dataclass_arg=_split_template("{arg}.u_bool", "arg"),
+        repr_conv="%s",
+        repr_arg=_split_template('{slot} ? "True" : "False"', "slot"),
+    ),
+    CType.VOID: _TypeCodegen(box="mp_const_none"),
+}
+
+# How many adjacent zero_init fields make a memset worthwhile in make_new
+_MEMSET_MIN_RUN = 3
+
+# Fixed handler skeletons; only the class names and case bodies vary
+_TYPE_FORWARD_DECL_FMT = (
+    "extern const mp_obj_type_t {c}_type;\n"
+    "static mp_obj_t {c}_make_new(const mp_obj_type_t *type, "
+    "size_t n_args, size_t n_kw, const mp_obj_t *args);"
+)
+_ATTR_HANDLER_FMT = (
+    "static void {c}_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {{\n"
+    "    {c}_obj_t *self = MP_OBJ_TO_PTR(self_in);\n"
+    "\n"
+    "    switch (attr) {{\n"
+    "{cases}"
+    "    }}\n"
+    "\n"
+    "    dest[1] = MP_OBJ_SENTINEL;\n"
+    "}}\n"
+)
+_ATTR_FIELD_CASE_FMT = (
+    "        case MP_QSTR_{name}:\n"
+    "            if (dest[0] == MP_OBJ_NULL) {{\n"
+    "                dest[0] = {boxed};\n"
+    "            }} else if (dest[1] != MP_OBJ_NULL) {{\n"
+    "                {slot} = {unboxed};\n"
+    "                dest[0] = MP_OBJ_NULL;\n"
+    "            }}\n"
+    "            return;\n"
+)
+_MAKE_NEW_HEADER_FMT = (
+    "static mp_obj_t {c}_make_new(const mp_obj_type_t *type, "
+    "size_t n_args, size_t n_kw, const mp_obj_t *args) {{\n"
+)
+# Keyword-aware argument parsing shared by both make_new flavours
+_ARG_PARSE_FMT = (
+    "    enum {{\n"
+    "{enum}"
+    "    }};\n"
+    "    static const mp_arg_t allowed_args[] = {{\n"
+    "{allowed}"
+    "    }};\n"
+    "\n"
+    "    mp_arg_val_t parsed[{n}];\n"
+    "    mp_arg_parse_all_kw_array(n_args, n_kw, args, {n}, allowed_args, parsed);\n"
+)
+_MAKE_NEW_ALLOC_FMT = "    {c}_obj_t *self = mp_obj_malloc({c}_obj_t, type);\n"
+_MAKE_NEW_RETURN = "\n    return MP_OBJ_FROM_PTR(self);\n}\n"
+_BINARY_OP_HEADER_FMT = (
+    "static mp_obj_t {c}_binary_op(mp_binary_op_t op, mp_obj_t lhs_in, mp_obj_t rhs_in) {{\n"
+)
+# Identity implies equality, as with Python's tuple-based dataclass __eq__
+_DATACLASS_EQ_PREAMBLE_FMT = (
+    "    if (op == MP_BINARY_OP_EQUAL) {{\n"
+    "        if (lhs_in == rhs_in) {{\n"
+    "            return mp_const_true;\n"
+    "        }}\n"
+    "        if (!mp_obj_is_type(rhs_in, mp_obj_get_type(lhs_in))) {{\n"
+    "            return mp_const_false;\n"
+    "        }}\n"
+    "        {c}_obj_t *lhs = MP_OBJ_TO_PTR(lhs_in);\n"
+    "        {c}_obj_t *rhs = MP_OBJ_TO_PTR(rhs_in);\n"
+)
+_TYPE_DEFINITION_FMT = (
+    "MP_DEFINE_CONST_OBJ_TYPE(\n    {c}_type,\n    MP_QSTR_{name},\n    {flags},\n{slots}\n);\n"
+)
+# Optional type slots in emission order. Bit i of a slot mask selects row i.
+_TYPE_SLOTS = (
+    "    make_new, {c}_make_new",
+    "    attr, {c}_attr",
+    "    print, {c}_print",
+    "    binary_op, {c}_binary_op",
+    "    unary_op, {c}_unary_op",
+    "    iter, {c}_iternext",
+    "    iter, {c}_getiter",
+    "    parent, &{base}_type",
+    "    locals_dict, &{c}_locals_dict",
+)
+_ITERNEXT_SLOT_BIT = 1 << _TYPE_SLOTS.index("    iter, {c}_iternext")
+
+
+@functools.cache
+def _type_definition_template(slot_mask: int) -> str:
+    """Return the type definition for a slot mask, leaving {c}, {name} and {base} open.
+
+    Most classes share a handful of slot shapes, so each is rendered only once.
+    """
+    slots = ",\n".join(slot for i, slot in enumerate(_TYPE_SLOTS) if slot_mask >> i & 1)
+    if slot_mask & _ITERNEXT_SLOT_BIT:
+        flags = "MP_TYPE_FLAG_ITER_IS_ITERNEXT"
+    else:
+        flags = "MP_TYPE_FLAG_NONE"
+    return _TYPE_DEFINITION_FMT.format(c="{c}", name="{name}", flags=flags, slots=slots)
+
+
+_GETITER_FMT = (
+    "static mp_obj_t {c}_getiter(mp_obj_t self_in, mp_obj_iter_buf_t *iter_buf) {{\n"
+    "    (void)iter_buf;\n"
+    "    return {iter_fn}_mp(self_in);\n"
+    "}}\n"
+)
+# __next__ already returns MP_OBJ_STOP_ITERATION instead of raising
+_ITERNEXT_SENTINEL_FMT = (
+    "static mp_obj_t {c}_iternext(mp_obj_t self_in) {{\n    return {next_fn}_mp(self_in);\n}}\n"
+)
+# Call the user's __next__ method, which should raise StopIteration when
+# done. We need to catch that and return MP_OBJ_STOP_ITERATION.
+_ITERNEXT_NLR_FMT = (
+    "static mp_obj_t {c}_iternext(mp_obj_t self_in) {{\n"
+    "    nlr_buf_t nlr;\n"
+    "    if (nlr_push(&nlr) == 0) {{\n"
+    "        mp_obj_t result = {next_fn}_mp(self_in);\n"
+    "        nlr_pop();\n"
+    "        return result;\n"
+    "    }} else {{\n"
+    "        // Check if StopIteration was raised\n"
+    "        mp_obj_base_t *exc = (mp_obj_base_t *)nlr.ret_val;\n"
+    "        if (mp_obj_is_subclass_fast(MP_OBJ_FROM_PTR(exc->type), "
+    "MP_OBJ_FROM_PTR(&mp_type_StopIteration))) {{\n"
+    "            return MP_OBJ_STOP_ITERATION;\n"
+    "        }}\n"
+    "        // Re-raise other exceptions\n"
+    "        nlr_jump(nlr.ret_val);\n"
+    "    }}\n"
+    "}}\n"
+)
+# User print handler keyed by (has __str__, has __repr__)
+_USER_PRINT_FMT = {
+    (True, True): (
+        "    mp_obj_t result;\n"
+        "    if (kind == PRINT_STR) {{\n"
+        "        result = {str_fn}_mp(self_in);\n"
+        "    }} else {{\n"
+        "        result = {repr_fn}_mp(self_in);\n"
+        "    }}\n"
+        "    mp_obj_print_helper(print, result, PRINT_STR);\n"
+    ),
+    # __repr__ only: Python semantics -- str() falls back to repr()
+    (False, True): (
+        "    (void)kind;\n"
+        "    mp_obj_t result = {repr_fn}_mp(self_in);\n"
+        "    mp_obj_print_helper(print, result, PRINT_STR);\n"
+    ),
+    # __str__ only: use for PRINT_STR, default for PRINT_REPR
+    (True, False): (
+        "    if (kind == PRINT_STR) {{\n"
+        "        mp_obj_t result = {str_fn}_mp(self_in);\n"
+        "        mp_obj_print_helper(print, result, PRINT_STR);\n"
+        "    }} else {{\n"
+        '        mp_printf(print, "<{name} object>");\n'
+        "    }}\n"
+    ),
+}
+_USER_PRINT_HANDLER_FMT = (
+    "static void {c}_print(const mp_print_t *print, mp_obj_t self_in, mp_print_kind_t kind) {{\n"
+    "{body}"
+    "}}\n"
+)
+
+
+# Dunder methods still callable by name, so they go in the locals dict
+_LOCALS_DUNDERS = frozenset({"__len__", "__getitem__", "__setitem__"})
+
+
+def _in_locals_dict(name: str, method: MethodIR) -> bool:
+    """Check whether a method is exposed through the type's locals dict."""
+    if method.is_property or name.startswith("_prop_"):
+        return False
+    return (
+        method.is_static
+        or method.is_classmethod
+        or not name.startswith("__")
+        or name in _LOCALS_DUNDERS
+    )
+
+
+def _default_arg_slot(c_type: CType, default_arg: DefaultArg | None) -> str | None:
+    """Return the kind and default of an optional mp_arg_t entry, or None if required."""
+    if default_arg is None:
+        return None
+    if c_type == CType.MP_INT_T:
+        if default_arg.value is None:
+            return None
+        return f"MP_ARG_INT, {{.u_int = {default_arg.value}}}"
+    if c_type == CType.MP_FLOAT_T:
+        return "MP_ARG_OBJ, {.u_obj = mp_const_none}"
+    if c_type == CType.BOOL:
+        if default_arg.value is None:
+            return None
+        return f"MP_ARG_BOOL, {{.u_bool = {'true' if default_arg.value else 'false'}}}"
+    if default_arg.c_expr is None:
+        return None
+    return f"MP_ARG_OBJ, {{.u_obj = {default_arg.c_expr}}}"
+
+
+def _arg_spec(c_type: CType, default_arg: DefaultArg | None) -> str:
+    """Return the kind (and default, if optional) of an __init__ mp_arg_t entry."""
+    default = _default_arg_slot(c_type, default_arg)
+    if default is None:
+        return f"MP_ARG_REQUIRED | {_TYPE_CODEGEN[c_type].arg_kind}"
+    return default
+
+
+def _dataclass_arg_spec(fld: FieldIR) -> str:
+    """Return the kind (and default, if optional) of a dataclass mp_arg_t entry."""
+    if not fld.has_default:
+        return f"MP_ARG_REQUIRED | {_TYPE_CODEGEN[fld.c_type].arg_kind}"
+    if fld.c_type == CType.MP_INT_T:
+        return f"MP_ARG_INT, {{.u_int = {fld.default_value}}}"
+    if fld.c_type == CType.BOOL:
+        return f"MP_ARG_BOOL, {{.u_bool = {'true' if fld.default_value else 'false'}}}"
+    return "MP_ARG_OBJ, {.u_obj = mp_const_none}"
 
 
 class ClassEmitter:
@@ -17,37 +352,86 @@ class ClassEmitter:
     def __init__(self, class_ir: ClassIR, module_c_name: str):
         self.class_ir = class_ir
         self.module_c_name = module_c_name
-        self.c_name = class_ir.c_name
-
-    def _vtable_access_path(self) -> str:
-        """Compute the C access path for the vtable pointer.
-
-        Base class: 'vtable'
-        Child class: 'super.vtable'
-        Grandchild: 'super.super.vtable'
-        """
+        # IRBuilder interns c_name already; hand-built ClassIRs may not
+        self.c_name = sys.intern(class_ir.c_name)
+        # Derived C identifiers used throughout the emitted code
+        self._obj_t = sys.intern(f"{self.c_name}_obj_t")
+        self._vtable_t = sys.intern(f"{self.c_name}_vtable_t")
+        self._vtable_inst = sys.intern(f"{self.c_name}_vtable_inst")
+
+        # Walk the base chain once. The vtable pointer lives in the root struct:
+        # 'vtable' for a base class, 'super.vtable' for a child, and so on.
         depth = 0
-        cls = self.class_ir
-        while cls.base:
+        root = class_ir
+        while root.base:
             depth += 1
-            cls = cls.base
-        if depth == 0:
-            return "vtable"
-        return "super." * depth + "vtable"
-
-    def _root_class_c_name(self) -> str:
-        cls = self.class_ir
-        while cls.base:
-            cls = cls.base
-        return cls.c_name
+            root = root.base
+        self._root_c_name = root.c_name
+        self._vtable_path = "super." * depth + "vtable"
+
+        # Layout-derived lists are reused by several emit_* methods.
+        self._vtable_entries = class_ir.get_vtable_entries()
+        self._fields_with_path = class_ir.get_all_fields_with_path()
+
+    # The get_all_* walks cover the base chain and traits. Several emit_*
+    # methods need each of them, so compute them once per emitter, on first use.
+    @functools.cached_property
+    def _all_methods(self) -> dict[str, MethodIR]:
+        return self.class_ir.get_all_methods()
+
+    @functools.cached_property
+    def _all_properties(self) -> dict[str, PropertyInfo]:
+        return self.class_ir.get_all_properties()
+
+    @functools.cached_property
+    def _all_traits(self) -> list[ClassIR]:
+        return self.class_ir.get_all_traits()
+
+    @functools.cached_property
+    def _instance_fields(self) -> list[FieldIR]:
+        return self.class_ir.get_instance_fields()
+
+    @functools.cached_property
+    def _locals_method_names(self) -> list[str]:
+        """Names of the methods exposed through the type's locals dict."""
+        return [name for name, method in self._all_methods.items() if _in_locals_dict(name, method)]
+
+    @functools.cached_property
+    def _final_constant_fields(self) -> list[FieldIR]:
+        return [f for f in self.class_ir.fields if f.is_final and f.final_value is not None]
+
+    @functools.cached_property
+    def _has_locals_dict(self) -> bool:
+        has_classvars = any(f.is_classvar and not f.is_final for f in self.class_ir.fields)
+        return bool(self._locals_method_names or self._final_constant_fields or has_classvars)
+
+    @functools.cached_property
+    def _field_groups(
+        self,
+    ) -> tuple[dict[str, _FieldEntry], list[_FieldEntry], list[_FieldEntry]]:
+        """Index _fields_with_path in one pass.
+
+        Returns (first field per name, unboxed fields, boxed object fields).
+        """
+        by_name: dict[str, _FieldEntry] = {}
+        pod_fields: list[_FieldEntry] = []
+        obj_fields: list[_FieldEntry] = []
+        for entry in self._fields_with_path:
+            fld = entry[0]
+            by_name.setdefault(fld.name, entry)
+            if _TYPE_CODEGEN[fld.c_type].is_obj:
+                obj_fields.append(entry)
+            else:
+                pod_fields.append(entry)
+        return by_name, pod_fields, obj_fields
 
     def emit_forward_declarations(self) -> list[str]:
         lines = []
-        lines.append(f"typedef struct _{self.c_name}_obj_t {self.c_name}_obj_t;")
+        lines.append(f"typedef struct _{self._obj_t} {self._obj_t};")
 
-        vtable_entries = self.class_ir.get_vtable_entries()
+        vtable_entries = self._vtable_entries
         if vtable_entries:
-            lines.append(f"typedef struct _{self.c_name}_vtable_t {self.c_name}_vtable_t;")
+            lines.append(f"typedef struct _{self._vtable_t} {self._vtable_t};")
 
         return lines
 
@@ -57,15 +441,7 @@ class ClassEmitter:
         These are needed when one class instantiates another class that is
         defined later in the file.
         """
-        lines = []
-        # Forward declare the type object
-        lines.append(f"extern const mp_obj_type_t {self.c_name}_type;")
-        # Forward declare make_new
-        lines.append(
-            f"static mp_obj_t {self.c_name}_make_new(const mp_obj_type_t *type, "
-            f"size_t n_args, size_t n_kw, const mp_obj_t *args);"
-        )
-        return lines
+        return [_TYPE_FORWARD_DECL_FMT.format(c=self.c_name)]
 
     def emit_native_forward_declarations(self) -> list[str]:
         """Emit forward declarations for native method functions.
@@ -95,7 +471,7 @@ class ClassEmitter:
             # Generate forward declaration for native version of the method
             params: list[str] = []
             if not method_ir.is_static and not method_ir.is_classmethod:
-                params.append(f"{self.c_name}_obj_t *self")
+                params.append(f"{self._obj_t} *self")
             for param_name, param_type in method_ir.params:
                 params.append(f"{param_type.to_c_type_str()} {param_name}")
             params_str = ", ".join(params) if params else "void"
@@ -173,29 +549,31 @@ class ClassEmitter:
         return lines
 
     def emit_struct(self) -> list[str]:
-        lines = []
-        vtable_entries = self.class_ir.get_vtable_entries()
+        buf = io.StringIO()
+        w = buf.write
+        vtable_entries = self._vtable_entries
 
         if vtable_entries:
-            lines.append(f"struct _{self.c_name}_vtable_t {{")
+            w(f"struct _{self._vtable_t} {{\n")
             for method_name, method_ir in vtable_entries:
                 ret_type = method_ir.return_type.to_c_type_str()
-                params = [f"{self.c_name}_obj_t *self"]
+                params = [f"{self._obj_t} *self"]
                 for param_name, param_type in method_ir.params:
                     params.append(f"{param_type.to_c_type_str()} {param_name}")
-                params_str = ", ".join(params)
-                lines.append(f"    {ret_type} (*{method_name})({params_str});")
-            lines.append("};")
-            lines.append("")
+                w(f"    {ret_type} (*{method_name})({', '.join(params)});\n")
+            w("};\n\n")
 
-        lines.append(f"struct _{self.c_name}_obj_t {{")
+        w(f"struct _{self._obj_t} {{\n")
 
         if self.class_ir.base:
-            lines.append(f"    {self.class_ir.base.c_name}_obj_t super;")
+            w(f"    {self.class_ir.base.c_name}_obj_t super;\n")
         else:
-            lines.append("    mp_obj_base_t base;")
+            w("    mp_obj_base_t base;\n")
             if vtable_entries:
-                lines.append(f"    const {self.c_name}_vtable_t *vtable;")
+                w(f"    const {self._vtable_t} *vtable;\n")
+
+        instance_fields = self._instance_fields
+        own_names = {fld.name for fld in instance_fields}
 
         # Emit fields from traits (traits don't have inheritance, so fields are flat)
         for trait in self.class_ir.traits:
@@ -204,142 +582,56 @@ class ClassEmitter:
                 if fld.is_final or fld.is_classvar:
                     continue
                 # Only emit if not already present in own fields or base
-                if not any(f.name == fld.name for f in self.class_ir.get_instance_fields()):
-                    lines.append(
-                        f"    {fld.get_c_type_str()} {fld.name};  // from trait {trait.name}"
-                    )
+                if fld.name not in own_names:
+                    w(f"    {fld.get_c_type_str()} {fld.name};  // from trait {trait.name}\n")
 
         # Emit this class's own instance fields (excluding Final and ClassVar)
-        for fld in self.class_ir.get_instance_fields():
-            lines.append(f"    {fld.get_c_type_str()} {fld.name};")
+        for fld in instance_fields:
+            w(f"    {fld.get_c_type_str()} {fld.name};\n")
 
-        lines.append("};")
-        lines.append("")
+        w("};\n")
 
-        return lines
+        return [buf.getvalue()]
 
-    def emit_field_descriptors(self) -> list[str]:
-        fields_with_path = self.class_ir.get_all_fields_with_path()
-        if not fields_with_path:
+    def emit_attr_handler(self) -> list[str]:
+        all_properties = self._all_properties
+        # Nothing to resolve: the type gets no attr slot, so emit no handler
+        if not self._fields_with_path and not all_properties:
             return []
 
-        lines = []
-        lines.append("typedef struct {")
-        lines.append("    qstr name;")
-        lines.append("    uint16_t offset;")
-        lines.append("    uint8_t type;")
-        lines.append(f"}} {self.c_name}_field_t;")
-        lines.append("")
-
-        lines.append(f"static const {self.c_name}_field_t {self.c_name}_fields[] = {{")
-
-        for fld, path in fields_with_path:
-            type_id = fld.c_type.to_field_type_id()
-            lines.append(
-                f"    {{ MP_QSTR_{fld.name}, offsetof({self.c_name}_obj_t, {path}), {type_id} }},"
+        box = self._box_property_result
+        unbox = self._unbox_property_value
+        # Properties and fields share one switch on the attribute qstr.
+        # Every field's C type is known here, so each case boxes/unboxes its
+        # slot directly instead of switching on a descriptor type tag at runtime.
+        # Properties shadow same-named fields, and the first field for a name
+        # wins, matching the previous lookup order.
+        cases = [f"{line}\n" for line in self._emit_property_dispatch(all_properties)]
+        field_by_name = self._field_groups[0]
+        for name, (fld, path) in field_by_name.items():
+            if name in all_properties:
+                continue
+            c_type = fld.c_type if fld.c_type.to_field_type_id() else CType.MP_OBJ_T
+            slot = f"self->{path}"
+            cases.append(
+                _ATTR_FIELD_CASE_FMT.format(
+                    name=fld.name,
+                    slot=slot,
+                    boxed=box(c_type, slot),
+                    unboxed=unbox(c_type, "dest[1]"),
+                )
             )
 
-        lines.append("    { MP_QSTR_NULL, 0, 0 }")
-        lines.append("};")
-        lines.append("")
-
-        return lines
-
-    def emit_attr_handler(self) -> list[str]:
-        all_fields = self.class_ir.get_all_fields()
-        all_properties = self.class_ir.get_all_properties()
-        if not all_fields:
-            return self._emit_simple_attr_handler()
-
-        lines = []
-        lines.append(
-            f"static void {self.c_name}_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {{"
-        )
-        lines.append(f"    {self.c_name}_obj_t *self = MP_OBJ_TO_PTR(self_in);")
-        lines.append("")
-        lines.extend(self._emit_property_dispatch(all_properties))
-        lines.append(
-            f"    for (const {self.c_name}_field_t *f = {self.c_name}_fields; f->name != MP_QSTR_NULL; f++) {{"
-        )
-        lines.append("        if (f->name == attr) {")
-        lines.append("            if (dest[0] == MP_OBJ_NULL) {")
-        lines.append("                char *ptr = (char *)self + f->offset;")
-        lines.append("                switch (f->type) {")
-        lines.append("                    case 0: dest[0] = *(mp_obj_t *)ptr; break;")
-        lines.append(
-            "                    case 1: dest[0] = mp_obj_new_int(*(mp_int_t *)ptr); break;"
-        )
-        lines.append(
-            "                    case 2: dest[0] = mp_obj_new_float(*(mp_float_t *)ptr); break;"
-        )
-        lines.append(
-            "                    case 3: dest[0] = *(bool *)ptr ? mp_const_true : mp_const_false; break;"
-        )
-        lines.append("                }")
-        lines.append("            } else if (dest[1] != MP_OBJ_NULL) {")
-        lines.append("                char *ptr = (char *)self + f->offset;")
-        lines.append("                switch (f->type) {")
-        lines.append("                    case 0: *(mp_obj_t *)ptr = dest[1]; break;")
-        lines.append(
-            "                    case 1: *(mp_int_t *)ptr = mp_obj_get_int(dest[1]); break;"
-        )
-        lines.append(
-            "                    case 2: *(mp_float_t *)ptr = mp_obj_get_float(dest[1]); break;"
-        )
-        lines.append("                    case 3: *(bool *)ptr = mp_obj_is_true(dest[1]); break;")
-        lines.append("                }")
-        lines.append("                dest[0] = MP_OBJ_NULL;")
-        lines.append("            }")
-        lines.append("            return;")
-        lines.append("        }")
-        lines.append("    }")
-        lines.append("")
-        lines.append("    dest[1] = MP_OBJ_SENTINEL;")
-        lines.append("}")
-        lines.append("")
-
-        return lines
-
-    def _emit_simple_attr_handler(self) -> list[str]:
-        all_properties = self.class_ir.get_all_properties()
-        lines = []
-        lines.append(
-            f"static void {self.c_name}_attr(mp_obj_t self_in, qstr attr, mp_obj_t *dest) {{"
-        )
-        if all_properties:
-            lines.append(f"    {self.c_name}_obj_t *self = MP_OBJ_TO_PTR(self_in);")
-            lines.append("")
-            lines.extend(self._emit_property_dispatch(all_properties))
-        lines.append("    dest[1] = MP_OBJ_SENTINEL;")
-        lines.append("}")
-        lines.append("")
-        return lines
+        return [_ATTR_HANDLER_FMT.format(c=self.c_name, cases="".join(cases))]
 
     def _box_property_result(self, c_type: CType, expr: str) -> str:
-        if c_type == CType.MP_INT_T:
-            return f"mp_obj_new_int({expr})"
-        if c_type == CType.MP_FLOAT_T:
-            return f"mp_obj_new_float({expr})"
-        if c_type == CType.BOOL:
-            return f"{expr} ? mp_const_true : mp_const_false"
-        if c_type == CType.VOID:
-            return "mp_const_none"
-        return expr
+        return _TYPE_CODEGEN[c_type].box.format(expr=expr)
 
     def _unbox_property_value(self, c_type: CType, expr: str) -> str:
-        if c_type == CType.MP_INT_T:
-            return f"mp_obj_get_int({expr})"
-        if c_type == CType.MP_FLOAT_T:
-            return f"mp_obj_get_float({expr})"
-        if c_type == CType.BOOL:
-            return f"mp_obj_is_true({expr})"
-        return expr
-
-    def _property_self_expr(self, method_c_name: str, prop_name: str, setter: bool = False) -> str:
-        suffix = f"_{prop_name}_setter" if setter else f"_{prop_name}"
-        owner_c_name = self.c_name
-        if method_c_name.endswith(suffix):
-            owner_c_name = method_c_name[: -len(suffix)]
+        return _TYPE_CODEGEN[c_type].unbox.format(expr=expr)
+
+    def _property_self_expr(self, method_ir: MethodIR) -> str:
+        owner_c_name = method_ir.owner_c_name or self.c_name
         if owner_c_name == self.c_name:
             return "self"
         return f"({owner_c_name}_obj_t *)self"
@@ -350,30 +642,29 @@ class ClassEmitter:
 
         lines = []
         for prop_name, prop in properties.items():
-            lines.append(f"    if (attr == MP_QSTR_{prop_name}) {{")
-            lines.append("        if (dest[0] == MP_OBJ_NULL) {")
-            getter_self = self._property_self_expr(prop.getter.c_name, prop_name)
+            lines.append(f"        case MP_QSTR_{prop_name}:")
+            lines.append("            if (dest[0] == MP_OBJ_NULL) {")
+            getter_self = self._property_self_expr(prop.getter)
             getter_call = f"{prop.getter.c_name}_native({getter_self})"
             lines.append(
-                f"            dest[0] = {self._box_property_result(prop.getter.return_type, getter_call)};"
+                f"                dest[0] = {self._box_property_result(prop.getter.return_type, getter_call)};"
             )
-            lines.append("            return;")
-            lines.append("        }")
-            lines.append("        if (dest[1] != MP_OBJ_NULL) {")
+            lines.append("                return;")
+            lines.append("            }")
+            lines.append("            if (dest[1] != MP_OBJ_NULL) {")
             if prop.setter and prop.setter.params:
                 setter_arg_type = prop.setter.params[0][1]
                 setter_arg = self._unbox_property_value(setter_arg_type, "dest[1]")
-                setter_self = self._property_self_expr(prop.setter.c_name, prop_name, setter=True)
+                setter_self = self._property_self_expr(prop.setter)
                 lines.append(
-                    f"            {prop.setter.c_name}_native({setter_self}, {setter_arg});"
+                    f"                {prop.setter.c_name}_native({setter_self}, {setter_arg});"
                 )
-                lines.append("            dest[0] = MP_OBJ_NULL;")
+                lines.append("                dest[0] = MP_OBJ_NULL;")
             else:
-                lines.append("            dest[1] = MP_OBJ_SENTINEL;")
-            lines.append("            return;")
-            lines.append("        }")
-            lines.append("    }")
-            lines.append("")
+                lines.append("                dest[1] = MP_OBJ_SENTINEL;")
+            lines.append("                return;")
+            lines.append("            }")
+            lines.append("            break;")
         return lines
 
     def emit_make_new(self) -> list[str]:
@@ -381,350 +672,207 @@ class ClassEmitter:
         if self.class_ir.is_trait:
             return []
 
-        lines = []
-        vtable_entries = self.class_ir.get_vtable_entries()
-
         if self.class_ir.is_dataclass and self.class_ir.dataclass_info:
             return self._emit_dataclass_make_new()
 
+        c = self.c_name
         init_method = self.class_ir.methods.get("__init__")
-
-        lines.append(
-            f"static mp_obj_t {self.c_name}_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args) {{"
-        )
+        buf = io.StringIO()
+        w = buf.write
+        w(_MAKE_NEW_HEADER_FMT.format(c=c))
 
         if init_method:
             num_params = len(init_method.params)
-            has_defaults = init_method.has_defaults
 
             if num_params > 0:
                 # Use mp_arg_parse_all_kw_array to handle both positional and keyword args
-                lines.append("    enum {")
-                for i, (param_name, _) in enumerate(init_method.params):
-                    lines.append(f"        ARG_{param_name},")
-                lines.append("    };")
-
-                lines.append("    static const mp_arg_t allowed_args[] = {")
-                for i, (param_name, param_type) in enumerate(init_method.params):
-                    default_arg = init_method.defaults.get(i)
-                    if param_type == CType.MP_INT_T:
-                        if default_arg is not None and default_arg.value is not None:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_INT, {{.u_int = {default_arg.value}}} }},"
-                            )
-                        else:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_REQUIRED | MP_ARG_INT }},"
-                            )
-                    elif param_type == CType.MP_FLOAT_T:
-                        if default_arg is not None:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_OBJ, {{.u_obj = mp_const_none}} }},"
-                            )
-                        else:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_REQUIRED | MP_ARG_OBJ }},"
-                            )
-                    elif param_type == CType.BOOL:
-                        if default_arg is not None and default_arg.value is not None:
-                            default_val = "true" if default_arg.value else "false"
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_BOOL, {{.u_bool = {default_val}}} }},"
-                            )
-                        else:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_REQUIRED | MP_ARG_BOOL }},"
-                            )
-                    else:
-                        if default_arg is not None and default_arg.c_expr is not None:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_OBJ, {{.u_obj = {default_arg.c_expr}}} }},"
-                            )
-                        else:
-                            lines.append(
-                                f"        {{ MP_QSTR_{param_name}, MP_ARG_REQUIRED | MP_ARG_OBJ }},"
-                            )
-                lines.append("    };")
-                lines.append("")
-
-                lines.append(f"    mp_arg_val_t parsed[{num_params}];")
-                lines.append(
-                    f"    mp_arg_parse_all_kw_array(n_args, n_kw, args, {num_params}, allowed_args, parsed);"
+                params = init_method.params
+                defaults = init_method.defaults
+                allowed = "".join(
+                    f"        {{ MP_QSTR_{name}, {_arg_spec(c_type, defaults.get(i))} }},\n"
+                    for i, (name, c_type) in enumerate(params)
+                )
+                w(
+                    _ARG_PARSE_FMT.format(
+                        enum="".join(f"        ARG_{name},\n" for name, _ in params),
+                        allowed=allowed,
+                        n=num_params,
+                    )
                 )
             else:
                 # No params to __init__ (just self)
-                lines.append("    mp_arg_check_num(n_args, n_kw, 0, 0, false);")
+                w("    mp_arg_check_num(n_args, n_kw, 0, 0, false);\n")
 
-        lines.append("")
-        lines.append(f"    {self.c_name}_obj_t *self = mp_obj_malloc({self.c_name}_obj_t, type);")
-
-        if vtable_entries:
-            vtable_path = self._vtable_access_path()
-            if self.class_ir.base:
-                root_c = self._root_class_c_name()
-                lines.append(
-                    f"    self->{vtable_path} = (const {root_c}_vtable_t *)&{self.c_name}_vtable_inst;"
-                )
-            else:
-                lines.append(f"    self->{vtable_path} = &{self.c_name}_vtable_inst;")
+        w("\n")
+        w(_MAKE_NEW_ALLOC_FMT.format(c=c))
+        w(self._vtable_init())
 
         # Initialize only instance fields (not Final or ClassVar)
-        for fld in self.class_ir.get_instance_fields():
-            if fld.c_type in (CType.MP_OBJ_T, CType.GENERAL):
-                lines.append(f"    self->{fld.name} = mp_const_none;")
-            elif fld.c_type == CType.MP_INT_T:
-                lines.append(f"    self->{fld.name} = 0;")
-            elif fld.c_type == CType.MP_FLOAT_T:
-                lines.append(f"    self->{fld.name} = 0.0;")
-            elif fld.c_type == CType.BOOL:
-                lines.append(f"    self->{fld.name} = false;")
+        w("".join(f"{line}\n" for line in self._emit_field_defaults()))
 
         if init_method:
             num_params = len(init_method.params)
             total_args = num_params + 1  # +1 for self
-            has_defaults = init_method.has_defaults
-            lines.append("")
+            w("\n")
 
             if num_params == 0:
                 # __init__ takes only self
-                lines.append(f"    {self.c_name}___init___mp(MP_OBJ_FROM_PTR(self));")
-            elif total_args > 3 or has_defaults:
+                w(f"    {c}___init___mp(MP_OBJ_FROM_PTR(self));\n")
+            elif total_args > 3 or init_method.has_defaults:
                 # VAR_BETWEEN calling convention: (size_t n_args, const mp_obj_t *args)
-                lines.append(f"    mp_obj_t init_args[{total_args}];")
-                lines.append("    init_args[0] = MP_OBJ_FROM_PTR(self);")
+                w(f"    mp_obj_t init_args[{total_args}];\n")
+                w("    init_args[0] = MP_OBJ_FROM_PTR(self);\n")
                 for i, (param_name, param_type) in enumerate(init_method.params):
-                    if param_type == CType.MP_INT_T:
-                        lines.append(
-                            f"    init_args[{i + 1}] = mp_obj_new_int(parsed[ARG_{param_name}].u_int);"
-                        )
-                    elif param_type == CType.MP_FLOAT_T:
-                        lines.append(f"    init_args[{i + 1}] = parsed[ARG_{param_name}].u_obj;")
-                    elif param_type == CType.BOOL:
-                        lines.append(
-                            f"    init_args[{i + 1}] = parsed[ARG_{param_name}].u_bool ? mp_const_true : mp_const_false;"
-                        )
-                    else:
-                        lines.append(f"    init_args[{i + 1}] = parsed[ARG_{param_name}].u_obj;")
-                lines.append(f"    {self.c_name}___init___mp({total_args}, init_args);")
+                    arg_fmt = _TYPE_CODEGEN[param_type].init_arg
+                    init_arg = arg_fmt.format(arg=f"parsed[ARG_{param_name}]")
+                    w(f"    init_args[{i + 1}] = {init_arg};\n")
+                w(f"    {c}___init___mp({total_args}, init_args);\n")
             else:
                 # Fixed args calling convention: (self, arg0, arg1, ...)
                 args_list = ["MP_OBJ_FROM_PTR(self)"]
-                for i, (param_name, param_type) in enumerate(init_method.params):
-                    if param_type == CType.MP_INT_T:
-                        args_list.append(f"mp_obj_new_int(parsed[ARG_{param_name}].u_int)")
-                    elif param_type == CType.MP_FLOAT_T:
-                        args_list.append(f"parsed[ARG_{param_name}].u_obj")
-                    elif param_type == CType.BOOL:
-                        args_list.append(
-                            f"parsed[ARG_{param_name}].u_bool ? mp_const_true : mp_const_false"
-                        )
-                    else:
-                        args_list.append(f"parsed[ARG_{param_name}].u_obj")
-                args_str = ", ".join(args_list)
-                lines.append(f"    {self.c_name}___init___mp({args_str});")
+                for param_name, param_type in init_method.params:
+                    arg_fmt = _TYPE_CODEGEN[param_type].init_arg
+                    args_list.append(arg_fmt.format(arg=f"parsed[ARG_{param_name}]"))
+                w(f"    {c}___init___mp({', '.join(args_list)});\n")
 
-        lines.append("")
-        lines.append("    return MP_OBJ_FROM_PTR(self);")
-        lines.append("}")
-        lines.append("")
+        w(_MAKE_NEW_RETURN)
+
+        return [buf.getvalue()]
+
+    def _emit_field_defaults(self) -> list[str]:
+        """Emit default values for instance fields in a fresh object.
 
+        Runs of _MEMSET_MIN_RUN or more adjacent int/float/bool fields are all
+        zero bits, so they are cleared with one memset. Object fields default
+        to mp_const_none, which is not zero, and keep their own assignment.
+        """
+        lines: list[str] = []
+        run: list[FieldIR] = []
+
+        def flush() -> None:
+            if len(run) >= _MEMSET_MIN_RUN:
+                first, last = run[0].name, run[-1].name
+                lines.append(
+                    f"    memset(&self->{first}, 0, offsetof({self._obj_t}, {last}) + "
+                    f"sizeof(self->{last}) - offsetof({self._obj_t}, {first}));"
+                )
+            else:
+                for fld in run:
+                    lines.append(f"    self->{fld.name} = {_TYPE_CODEGEN[fld.c_type].default};")
+            run.clear()
+
+        for fld in self._instance_fields:
+            info = _TYPE_CODEGEN[fld.c_type]
+            if info.zero_init:
+                run.append(fld)
+                continue
+            flush()
+            init_value = info.default
+            if init_value is not None:
+                lines.append(f"    self->{fld.name} = {init_value};")
+        flush()
         return lines
 
     def _emit_dataclass_make_new(self) -> list[str]:
-        lines = []
-        fields_with_path = self.class_ir.get_all_fields_with_path()
-        vtable_entries = self.class_ir.get_vtable_entries()
-
-        lines.append(
-            f"static mp_obj_t {self.c_name}_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *args) {{"
-        )
+        c = self.c_name
+        fields_with_path = self._fields_with_path
 
         if fields_with_path:
-            lines.append("    enum {")
-            for fld, _ in fields_with_path:
-                lines.append(f"        ARG_{fld.name},")
-            lines.append("    };")
-
-            lines.append("    static const mp_arg_t allowed_args[] = {")
-            for fld, _ in fields_with_path:
-                if fld.c_type == CType.MP_INT_T:
-                    if fld.has_default:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_INT, {{.u_int = {fld.default_value}}} }},"
-                        )
-                    else:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_REQUIRED | MP_ARG_INT }},"
-                        )
-                elif fld.c_type == CType.MP_FLOAT_T:
-                    if fld.has_default:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_OBJ, {{.u_obj = mp_const_none}} }},"
-                        )
-                    else:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_REQUIRED | MP_ARG_OBJ }},"
-                        )
-                elif fld.c_type == CType.BOOL:
-                    if fld.has_default:
-                        default_val = "true" if fld.default_value else "false"
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_BOOL, {{.u_bool = {default_val}}} }},"
-                        )
-                    else:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_REQUIRED | MP_ARG_BOOL }},"
-                        )
-                else:
-                    if fld.has_default:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_OBJ, {{.u_obj = mp_const_none}} }},"
-                        )
-                    else:
-                        lines.append(
-                            f"        {{ MP_QSTR_{fld.name}, MP_ARG_REQUIRED | MP_ARG_OBJ }},"
-                        )
-            lines.append("    };")
-            lines.append("")
-
-            lines.append(f"    mp_arg_val_t parsed[{len(fields_with_path)}];")
-            lines.append(
-                f"    mp_arg_parse_all_kw_array(n_args, n_kw, args, {len(fields_with_path)}, allowed_args, parsed);"
+            n_fields = len(fields_with_path)
+            enum_str = "".join(f"        ARG_{fld.name},\n" for fld, _ in fields_with_path)
+            allowed_str = "".join(
+                f"        {{ MP_QSTR_{fld.name}, {_dataclass_arg_spec(fld)} }},\n"
+                for fld, _ in fields_with_path
+            )
+            arg_parsing = (
+                _ARG_PARSE_FMT.format(enum=enum_str, allowed=allowed_str, n=n_fields) + "\n"
             )
-            lines.append("")
         else:
-            lines.append("    (void)n_args;")
-            lines.append("    (void)n_kw;")
-            lines.append("    (void)args;")
-            lines.append("")
-
-        lines.append(f"    {self.c_name}_obj_t *self = mp_obj_malloc({self.c_name}_obj_t, type);")
-
-        if vtable_entries:
-            vtable_path = self._vtable_access_path()
-            if self.class_ir.base:
-                root_c = self._root_class_c_name()
-                lines.append(
-                    f"    self->{vtable_path} = (const {root_c}_vtable_t *)&{self.c_name}_vtable_inst;"
-                )
-            else:
-                lines.append(f"    self->{vtable_path} = &{self.c_name}_vtable_inst;")
+            arg_parsing = "    (void)n_args;\n    (void)n_kw;\n    (void)args;\n\n"
 
+        assigns: list[str] = []
         for fld, path in fields_with_path:
-            if fld.c_type == CType.MP_INT_T:
-                lines.append(f"    self->{path} = parsed[ARG_{fld.name}].u_int;")
-            elif fld.c_type == CType.MP_FLOAT_T:
-                lines.append(f"    self->{path} = mp_obj_get_float(parsed[ARG_{fld.name}].u_obj);")
-            elif fld.c_type == CType.BOOL:
-                lines.append(f"    self->{path} = parsed[ARG_{fld.name}].u_bool;")
-            else:
-                lines.append(f"    self->{path} = parsed[ARG_{fld.name}].u_obj;")
-
-        lines.append("")
-        lines.append("    return MP_OBJ_FROM_PTR(self);")
-        lines.append("}")
-        lines.append("")
+            pre, post = _TYPE_CODEGEN[fld.c_type].dataclass_arg
+            assigns.append(f"    self->{path} = {pre}parsed[ARG_{fld.name}]{post};\n")
+        assigns_str = "".join(assigns)
+
+        return [
+            _MAKE_NEW_HEADER_FMT.format(c=c)
+            + arg_parsing
+            + _MAKE_NEW_ALLOC_FMT.format(c=c)
+            + self._vtable_init()
+            + assigns_str
+            + _MAKE_NEW_RETURN
+        ]
 
-        return lines
+    def _vtable_init(self) -> str:
+        """Point a new object's vtable at this class's table, if it has one."""
+        if not self._vtable_entries:
+            return ""
+        if self.class_ir.base:
+            return (
+                f"    self->{self._vtable_path} = "
+                f"(const {self._root_c_name}_vtable_t *)&{self._vtable_inst};\n"
+            )
+        return f"    self->{self._vtable_path} = &{self._vtable_inst};\n"
 
     def emit_print_handler(self) -> list[str]:
         has_user_repr = self.class_ir.has_repr
         has_user_str = self.class_ir.has_str
-        has_dataclass_repr = (
-            self.class_ir.is_dataclass
-            and self.class_ir.dataclass_info
-            and self.class_ir.dataclass_info.repr_
-            and not has_user_repr
-        )
 
         # Case 1: User-defined __str__ and/or __repr__
         if has_user_str or has_user_repr:
             return self._emit_user_print_handler(has_user_str, has_user_repr)
 
         # Case 2: Dataclass auto-generated repr (no user override)
-        if has_dataclass_repr:
+        if self._has_dataclass_repr():
             return self._emit_dataclass_print_handler()
 
         return []
 
     def _emit_user_print_handler(self, has_str: bool, has_repr: bool) -> list[str]:
         """Emit print handler that dispatches to user __str__/__repr__ methods."""
-        lines: list[str] = []
-        repr_c_name = self.class_ir.methods.get("__repr__")
-        str_c_name = self.class_ir.methods.get("__str__")
-
-        lines.append(
-            f"static void {self.c_name}_print(const mp_print_t *print, "
-            f"mp_obj_t self_in, mp_print_kind_t kind) {{"
+        repr_method = self.class_ir.methods.get("__repr__")
+        str_method = self.class_ir.methods.get("__str__")
+        body = _USER_PRINT_FMT[has_str, has_repr].format(
+            str_fn=str_method.c_name if str_method else "",
+            repr_fn=repr_method.c_name if repr_method else "",
+            name=self.class_ir.name,
         )
-
-        if has_str and has_repr:
-            # Dispatch based on kind
-            assert repr_c_name is not None
-            assert str_c_name is not None
-            lines.append("    mp_obj_t result;")
-            lines.append("    if (kind == PRINT_STR) {")
-            lines.append(f"        result = {str_c_name.c_name}_mp(self_in);")
-            lines.append("    } else {")
-            lines.append(f"        result = {repr_c_name.c_name}_mp(self_in);")
-            lines.append("    }")
-            lines.append("    mp_obj_print_helper(print, result, PRINT_STR);")
-        elif has_repr:
-            # __repr__ only: Python semantics -- str() falls back to repr()
-            assert repr_c_name is not None
-            lines.append("    (void)kind;")
-            lines.append(f"    mp_obj_t result = {repr_c_name.c_name}_mp(self_in);")
-            lines.append("    mp_obj_print_helper(print, result, PRINT_STR);")
-        else:
-            # __str__ only: use for PRINT_STR, default for PRINT_REPR
-            assert str_c_name is not None
-            lines.append("    if (kind == PRINT_STR) {")
-            lines.append(f"        mp_obj_t result = {str_c_name.c_name}_mp(self_in);")
-            lines.append("        mp_obj_print_helper(print, result, PRINT_STR);")
-            lines.append("    } else {")
-            lines.append(f'        mp_printf(print, "<{self.class_ir.name} object>");')
-            lines.append("    }")
-
-        lines.append("}")
-        lines.append("")
-        return lines
+        return [_USER_PRINT_HANDLER_FMT.format(c=self.c_name, body=body)]
 
     def _emit_dataclass_print_handler(self) -> list[str]:
         """Emit auto-generated print handler for @dataclass classes."""
-        lines: list[str] = []
-        fields_with_path = self.class_ir.get_all_fields_with_path()
-
-        lines.append(
+        buf = io.StringIO()
+        w = buf.write
+        w(
             f"static void {self.c_name}_print(const mp_print_t *print, "
-            f"mp_obj_t self_in, mp_print_kind_t kind) {{"
+            "mp_obj_t self_in, mp_print_kind_t kind) {\n"
+            f"    {self._obj_t} *self = MP_OBJ_TO_PTR(self_in);\n"
+            "    (void)kind;\n"
         )
-        lines.append(f"    {self.c_name}_obj_t *self = MP_OBJ_TO_PTR(self_in);")
-        lines.append("    (void)kind;")
-        lines.append(f'    mp_printf(print, "{self.class_ir.name}(");')
-
-        for i, (fld, path) in enumerate(fields_with_path):
-            separator = ", " if i > 0 else ""
-            if fld.c_type == CType.MP_INT_T:
-                lines.append(
-                    f'    mp_printf(print, "{separator}{fld.name}=%d", (int)self->{path});'
-                )
-            elif fld.c_type == CType.MP_FLOAT_T:
-                lines.append(f'    mp_printf(print, "{separator}{fld.name}=");')
-                lines.append(
-                    f"    mp_obj_print_helper(print, mp_obj_new_float(self->{path}), PRINT_REPR);"
-                )
-            elif fld.c_type == CType.BOOL:
-                lines.append(
-                    f'    mp_printf(print, "{separator}{fld.name}=%s", self->{path} ? "True" : "False");'
-                )
-            else:
-                lines.append(f'    mp_printf(print, "{separator}{fld.name}=");')
-                lines.append(f"    mp_obj_print_helper(print, self->{path}, PRINT_REPR);")
-
-        lines.append('    mp_printf(print, ")");')
-        lines.append("}")
-        lines.append("")
-        return lines
+        # Runs of printf-able fields, and the text around them, share one
+        # mp_printf call; only boxed fields need a call of their own.
+        fmt = f"{self.class_ir.name}("
+        args: list[str] = []
+        sep = ""
+        for fld, path in self._fields_with_path:
+            codegen = _TYPE_CODEGEN[fld.c_type]
+            fmt += f"{sep}{fld.name}="
+            sep = ", "
+            if codegen.repr_conv is not None:
+                head, tail = codegen.repr_arg
+                fmt += codegen.repr_conv
+                args.append(f", {head}self->{path}{tail}")
+                continue
+            w(f'    mp_printf(print, "{fmt}"{"".join(args)});\n')
+            slot = codegen.box.format(expr=f"self->{path}")
+            w(f"    mp_obj_print_helper(print, {slot}, PRINT_REPR);\n")
+            fmt = ""
+            args.clear()
+        w(f'    mp_printf(print, "{fmt})"{"".join(args)});\n')
+        w("}\n")
+        return [buf.getvalue()]
 
     def _has_user_comparison_methods(self) -> bool:
         """Check if this class has any user-defined comparison methods."""
@@ -737,6 +885,15 @@ class ClassEmitter:
             or self.class_ir.has_ge
         )
 
+    def _has_dataclass_repr(self) -> bool:
+        """Check if this is a dataclass with auto-generated __repr__."""
+        return (
+            self.class_ir.is_dataclass
+            and self.class_ir.dataclass_info is not None
+            and self.class_ir.dataclass_info.repr_
+            and not self.class_ir.has_repr  # No user override
+        )
+
     def _has_dataclass_eq(self) -> bool:
         """Check if this is a dataclass with auto-generated __eq__."""
         return (
@@ -754,10 +911,10 @@ class ClassEmitter:
         if not has_user_comparisons and not has_dataclass_eq:
             return []
 
-        lines: list[str] = []
-        lines.append(
-            f"static mp_obj_t {self.c_name}_binary_op(mp_binary_op_t op, mp_obj_t lhs_in, mp_obj_t rhs_in) {{"
-        )
+        c = self.c_name
+        buf = io.StringIO()
+        w = buf.write
+        w(_BINARY_OP_HEADER_FMT.format(c=c))
 
         # Map of comparison ops to methods
         comparison_ops = [
@@ -768,47 +925,86 @@ class ClassEmitter:
             ("MP_BINARY_OP_MORE", "__gt__", self.class_ir.has_gt),
             ("MP_BINARY_OP_MORE_EQUAL", "__ge__", self.class_ir.has_ge),
         ]
+        user_ops = [
+            (mp_op, self.class_ir.methods[py_method])
+            for mp_op, py_method, has_method in comparison_ops
+            if has_method and py_method in self.class_ir.methods
+        ]
+
+        # A single supported op needs no if-chain: select it with one conditional
+        if len(user_ops) == 1 and not has_dataclass_eq:
+            mp_op, method_ir = user_ops[0]
+            w(f"    return op == {mp_op} ? {method_ir.c_name}_mp(lhs_in, rhs_in) : MP_OBJ_NULL;\n")
+            w("}\n")
+            return [buf.getvalue()]
 
         # Emit dispatch for user-defined comparison methods
-        for mp_op, py_method, has_method in comparison_ops:
-            if has_method and py_method in self.class_ir.methods:
-                method_ir = self.class_ir.methods[py_method]
-                lines.append(f"    if (op == {mp_op}) {{")
-                lines.append(f"        return {method_ir.c_name}_mp(lhs_in, rhs_in);")
-                lines.append("    }")
+        w(
+            "".join(
+                f"    if (op == {mp_op}) {{\n"
+                f"        return {method_ir.c_name}_mp(lhs_in, rhs_in);\n"
+                "    }\n"
+                for mp_op, method_ir in user_ops
+            )
+        )
 
         # Handle dataclass auto-generated __eq__
         if has_dataclass_eq:
-            lines.append("    if (op == MP_BINARY_OP_EQUAL) {")
-            lines.append("        if (!mp_obj_is_type(rhs_in, mp_obj_get_type(lhs_in))) {")
-            lines.append("            return mp_const_false;")
-            lines.append("        }")
-            lines.append(f"        {self.c_name}_obj_t *lhs = MP_OBJ_TO_PTR(lhs_in);")
-            lines.append(f"        {self.c_name}_obj_t *rhs = MP_OBJ_TO_PTR(rhs_in);")
-
-            fields_with_path = self.class_ir.get_all_fields_with_path()
-            conditions = []
-            for fld, path in fields_with_path:
-                if fld.c_type in (CType.MP_OBJ_T, CType.GENERAL):
-                    conditions.append(f"mp_obj_equal(lhs->{path}, rhs->{path})")
-                else:
-                    conditions.append(f"lhs->{path} == rhs->{path}")
-
-            if conditions:
-                cond_str = " &&\n            ".join(conditions)
-                lines.append("        return mp_obj_new_bool(")
-                lines.append(f"            {cond_str}")
-                lines.append("        );")
+            w(_DATACLASS_EQ_PREAMBLE_FMT.format(c=c))
+
+            memcmp_fields = self._memcmp_eq_fields()
+            _, pod_fields, obj_fields = self._field_groups
+            if memcmp_fields:
+                # A contiguous run of same-typed ints/bools compares as one block
+                first, c_type = memcmp_fields[0].name, memcmp_fields[0].get_c_type_str()
+                w(
+                    f"        return mp_obj_new_bool(memcmp(&lhs->{first}, &rhs->{first}, "
+                    f"{len(memcmp_fields)} * sizeof({c_type})) == 0);\n"
+                )
+            elif pod_fields or obj_fields:
+                # Compare unboxed fields first so a mismatch short-circuits before
+                # any mp_obj_equal call dispatches through the object's binary_op.
+                w("        return mp_obj_new_bool(\n            ")
+                w(
+                    " &&\n            ".join(
+                        [f"lhs->{path} == rhs->{path}" for _, path in pod_fields]
+                        + [f"mp_obj_equal(lhs->{path}, rhs->{path})" for _, path in obj_fields]
+                    )
+                )
+                w("\n        );\n")
             else:
-                lines.append("        return mp_const_true;")
-            lines.append("    }")
+                w("        return mp_const_true;\n")
+            w("    }\n")
 
         # Return NULL for unsupported operations
-        lines.append("    return MP_OBJ_NULL;")
-        lines.append("}")
-        lines.append("")
+        w("    return MP_OBJ_NULL;\n")
+        w("}\n")
 
-        return lines
+        return [buf.getvalue()]
+
+    def _uniform_own_fields(self) -> list[FieldIR]:
+        """Return the instance fields if they form one same-typed block, or [].
+
+        Only a class with no base or traits qualifies: its struct then ends with its
+        own instance fields in declaration order. If all of them share one C type,
+        the block has no padding and is laid out like an array of that type.
+        """
+        if self.class_ir.base or self.class_ir.traits:
+            return []
+        fields = [fld for fld, _ in self._fields_with_path]
+        if not fields or any(fld.c_type != fields[0].c_type for fld in fields):
+            return []
+        return fields
+
+    def _memcmp_eq_fields(self) -> list[FieldIR]:
+        """Return the fields a dataclass __eq__ can compare with one memcmp, or [].
+
+        For a uniform block of integer fields, bytewise and per-field equality agree.
+        """
+        fields = self._uniform_own_fields()
+        if len(fields) < 4 or fields[0].c_type not in (CType.MP_INT_T, CType.BOOL):
+            return []
+        return fields
 
     def emit_unary_op_handler(self) -> list[str]:
         """Emit unary_op handler for __hash__."""
@@ -824,10 +1020,9 @@ class ClassEmitter:
         lines.append(
             f"static mp_obj_t {self.c_name}_unary_op(mp_unary_op_t op, mp_obj_t self_in) {{"
         )
-        lines.append("    if (op == MP_UNARY_OP_HASH) {")
-        lines.append(f"        return {method_ir.c_name}_mp(self_in);")
-        lines.append("    }")
-        lines.append("    return MP_OBJ_NULL;")
+        lines.append(
+            f"    return op == MP_UNARY_OP_HASH ? {method_ir.c_name}_mp(self_in) : MP_OBJ_NULL;"
+        )
         lines.append("}")
         lines.append("")
 
@@ -835,99 +1030,72 @@ class ClassEmitter:
 
     def emit_iter_handlers(self) -> list[str]:
         """Emit getiter and iternext handlers for __iter__ and __next__."""
-        if not self.class_ir.has_iter and not self.class_ir.has_next:
-            return []
-
-        lines: list[str] = []
-
-        is_self_iterator = self.class_ir.has_iter and self.class_ir.has_next
-
-        if is_self_iterator:
-            # Common case: __iter__ returns self, __next__ does the work.
-            # Use MP_TYPE_FLAG_ITER_IS_ITERNEXT: the single iter slot IS the
-            # iternext function and MicroPython auto-returns self for getiter.
-            pass
-        elif self.class_ir.has_iter and "__iter__" in self.class_ir.methods:
-            # __iter__ only (no __next__): emit a getiter wrapper
-            method_ir = self.class_ir.methods["__iter__"]
-            lines.append(
-                f"static mp_obj_t {self.c_name}_getiter(mp_obj_t self_in, mp_obj_iter_buf_t *iter_buf) {{"
-            )
-            lines.append("    (void)iter_buf;")
-            lines.append(f"    return {method_ir.c_name}_mp(self_in);")
-            lines.append("}")
-            lines.append("")
-
-        # Emit iternext handler for __next__
-        if self.class_ir.has_next and "__next__" in self.class_ir.methods:
-            method_ir = self.class_ir.methods["__next__"]
-            lines.append(f"static mp_obj_t {self.c_name}_iternext(mp_obj_t self_in) {{")
-            # Call the user's __next__ method, which should raise StopIteration
-            # when done. We need to catch that and return MP_OBJ_STOP_ITERATION.
-            lines.append("    nlr_buf_t nlr;")
-            lines.append("    if (nlr_push(&nlr) == 0) {")
-            lines.append(f"        mp_obj_t result = {method_ir.c_name}_mp(self_in);")
-            lines.append("        nlr_pop();")
-            lines.append("        return result;")
-            lines.append("    } else {")
-            lines.append("        // Check if StopIteration was raised")
-            lines.append("        mp_obj_base_t *exc = (mp_obj_base_t *)nlr.ret_val;")
-            lines.append(
-                "        if (mp_obj_is_subclass_fast(MP_OBJ_FROM_PTR(exc->type), MP_OBJ_FROM_PTR(&mp_type_StopIteration))) {"
-            )
-            lines.append("            return MP_OBJ_STOP_ITERATION;")
-            lines.append("        }")
-            lines.append("        // Re-raise other exceptions")
-            lines.append("        nlr_jump(nlr.ret_val);")
-            lines.append("    }")
-            lines.append("}")
-            lines.append("")
-
-        # For MP_TYPE_FLAG_ITER_IS_CUSTOM: emit the getiter_iternext struct
-        if is_self_iterator:
-            # Self-iterator: no struct needed, use MP_TYPE_FLAG_ITER_IS_ITERNEXT
-            pass
-        elif self.class_ir.has_iter and self.class_ir.has_next:
-            # Custom: separate getiter and iternext
-            lines.append(
-                f"static const mp_getiter_iternext_custom_t {self.c_name}_iter_custom = {{"
-            )
-            lines.append(f"    .getiter = {self.c_name}_getiter,")
-            lines.append(f"    .iternext = {self.c_name}_iternext,")
-            lines.append("}};")
-            lines.append("")
-
-        return lines
+        methods = self.class_ir.methods
+        match (self.class_ir.has_iter, self.class_ir.has_next):
+            case (_, True) if "__next__" in methods:
+                # With __next__ the type uses MP_TYPE_FLAG_ITER_IS_ITERNEXT: the
+                # single iter slot IS the iternext function, and MicroPython
+                # returns self for getiter, so any __iter__ needs no wrapper.
+                method_ir = methods["__next__"]
+                if method_ir.returns_stop_iteration_sentinel:
+                    fmt = _ITERNEXT_SENTINEL_FMT
+                else:
+                    fmt = _ITERNEXT_NLR_FMT
+                return [fmt.format(c=self.c_name, next_fn=method_ir.c_name)]
+            case (True, False) if "__iter__" in methods:
+                # __iter__ only: emit a getiter wrapper
+                iter_fn = methods["__iter__"].c_name
+                return [_GETITER_FMT.format(c=self.c_name, iter_fn=iter_fn)]
+            case _:
+                return []
 
     def emit_vtable_instance(self) -> list[str]:
-        vtable_entries = self.class_ir.get_vtable_entries()
+        vtable_entries = self._vtable_entries
         if not vtable_entries:
             return []
 
-        lines = []
-        lines.append(f"static const {self.c_name}_vtable_t {self.c_name}_vtable_inst = {{")
-
+        # Inherited methods take the parent's self type. Forward them through a
+        # thunk with this class's self type so each slot holds a properly typed
+        # pointer instead of a function-pointer cast.
+        lines: list[str] = []
+        slots: list[str] = []
         for method_name, method_ir in vtable_entries:
-            # Check if method belongs to a parent class (needs cast)
-            method_belongs_to_parent = not method_ir.c_name.startswith(self.c_name + "_")
+            owner_c_name = method_ir.owner_c_name or self._find_owner_c_name(method_name)
+            if owner_c_name == self.c_name:
+                slots.append(f"    .{method_name} = {method_ir.c_name}_native,")
+                continue
 
-            if method_belongs_to_parent:
-                # Build cast to child's function pointer type
-                ret_type = method_ir.return_type.to_c_type_str()
-                params = [f"{self.c_name}_obj_t *"]
-                for _, param_type in method_ir.params:
-                    params.append(param_type.to_c_type_str())
-                params_str = ", ".join(params)
-                cast = f"({ret_type} (*)({params_str}))"
-                lines.append(f"    .{method_name} = {cast}{method_ir.c_name}_native,")
-            else:
-                lines.append(f"    .{method_name} = {method_ir.c_name}_native,")
+            thunk = f"{self.c_name}_{method_name}_thunk"
+            ret_type = method_ir.return_type.to_c_type_str()
+            params = [f"{self._obj_t} *self"]
+            args = [f"({owner_c_name}_obj_t *)self"]
+            for param_name, param_type in method_ir.params:
+                params.append(f"{param_type.to_c_type_str()} {param_name}")
+                args.append(param_name)
+            call = f"{method_ir.c_name}_native({', '.join(args)})"
+            # Only ever called through the vtable, so there is nothing to inline
+            lines.append(f"static {ret_type} {thunk}({', '.join(params)}) {{")
+            lines.append(f"    {call};" if ret_type == "void" else f"    return {call};")
+            lines.append("}")
+            lines.append("")
+            slots.append(f"    .{method_name} = {thunk},")
 
+        lines.append(f"static const {self._vtable_t} {self._vtable_inst} = {{")
+        lines.extend(slots)
         lines.append("};")
         lines.append("")
 
         return lines
 
+    def _find_owner_c_name(self, method_name: str) -> str:
+        """Find the C name of the nearest class, this one first, that defines a method."""
+        cls: ClassIR | None = self.class_ir
+        while cls:
+            if method_name in cls.methods:
+                return cls.c_name
+            cls = cls.base
+        return self.c_name
+
     def _get_own_or_base_method(self, method_name: str) -> MethodIR | None:
         """Get method if defined in this class or its concrete base chain (not traits)."""
         # Check this class's own methods
@@ -951,7 +1119,7 @@ class ClassEmitter:
         if self.class_ir.is_trait:
             return []
 
-        all_traits = self.class_ir.get_all_traits()
+        all_traits = self._all_traits
         if not all_traits:
             return []
 
@@ -978,7 +1146,7 @@ class ClassEmitter:
 
                 # Generate wrapper function signature
                 ret_type = trait_method.return_type.to_c_type_str()
-                params = [f"{self.c_name}_obj_t *self"]
+                params = [f"{self._obj_t} *self"]
                 param_names = []
                 for param_name, param_type in trait_method.params:
                     params.append(f"{param_type.to_c_type_str()} {param_name}")
@@ -1006,7 +1174,7 @@ class ClassEmitter:
                             lines.append("")
                             # Also generate MP wrapper for this method
                             lines.append(f"static mp_obj_t {wrapper_name}_mp(mp_obj_t self_in) {{")
-                            lines.append(f"    {self.c_name}_obj_t *self = MP_OBJ_TO_PTR(self_in);")
+                            lines.append(f"    {self._obj_t} *self = MP_OBJ_TO_PTR(self_in);")
                             lines.append(f"    return {wrapper_name}_native(self);")
                             lines.append("}")
                             lines.append(
@@ -1028,7 +1196,7 @@ class ClassEmitter:
                 lines.append("")
                 # Also generate MP wrapper for the fallback
                 lines.append(f"static mp_obj_t {wrapper_name}_mp(mp_obj_t self_in) {{")
-                lines.append(f"    {self.c_name}_obj_t *self = MP_OBJ_TO_PTR(self_in);")
+                lines.append(f"    {self._obj_t} *self = MP_OBJ_TO_PTR(self_in);")
                 lines.append(f"    return {wrapper_name}_native(self);")
                 lines.append("}")
                 lines.append(f"MP_DEFINE_CONST_FUN_OBJ_1({wrapper_name}_obj, {wrapper_name}_mp);")
@@ -1046,7 +1214,7 @@ class ClassEmitter:
         if self.class_ir.is_trait:
             return []  # Traits don't have trait vtables
 
-        all_traits = self.class_ir.get_all_traits()
+        all_traits = self._all_traits
         if not all_traits:
             return []
 
@@ -1064,7 +1232,7 @@ class ClassEmitter:
                 if method_name.startswith("_"):
                     continue  # Skip private methods in trait vtable
                 ret_type = method_ir.return_type.to_c_type_str()
-                params = [f"{self.c_name}_obj_t *self"]
+                params = [f"{self._obj_t} *self"]
                 for param_name, param_type in method_ir.params:
                     params.append(f"{param_type.to_c_type_str()} {param_name}")
                 params_str = ", ".join(params)
@@ -1099,50 +1267,36 @@ class ClassEmitter:
         return lines
 
     def emit_locals_dict(self) -> list[str]:
-        # Get all methods including inherited ones
-        all_methods = self.class_ir.get_all_methods()
-        method_names = [
-            name
-            for name, method in all_methods.items()
-            if not method.is_property
-            and not name.startswith("_prop_")
-            and (
-                method.is_static
-                or method.is_classmethod
-                or not name.startswith("__")
-                or name in ("__len__", "__getitem__", "__setitem__")
-            )
-        ]
-
-        # Collect Final constants and ClassVar fields for locals dict
-        final_fields = [f for f in self.class_ir.fields if f.is_final and f.final_value is not None]
-        classvar_fields = [f for f in self.class_ir.fields if f.is_classvar and not f.is_final]
-
-        # Check if we have anything to emit
-        if not method_names and not final_fields and not classvar_fields:
+        if not self._has_locals_dict:
             return []
 
-        lines: list[str] = []
+        # Get all methods including inherited ones
+        all_methods = self._all_methods
+        method_names = self._locals_method_names
+        final_fields = self._final_constant_fields
+
+        c = self.c_name
+        buf = io.StringIO()
+        w = buf.write
+        has_wrapped_methods = False
         for name in method_names:
             method = all_methods[name]
             if method.is_static or method.is_classmethod:
+                has_wrapped_methods = True
                 # Only emit wrapper struct if method belongs to this class (not inherited)
-                is_own_method = name in self.class_ir.methods
-                if is_own_method:
-                    lines.append(
-                        f"static const mp_rom_obj_static_class_method_t {method.c_name}_obj = {{"
-                    )
+                if name in self.class_ir.methods:
                     method_type = (
                         "mp_type_staticmethod" if method.is_static else "mp_type_classmethod"
                     )
-                    lines.append(f"    {{&{method_type}}}, MP_ROM_PTR(&{method.c_name}_fun_obj)")
-                    lines.append("};")
-        if any(
-            all_methods[name].is_static or all_methods[name].is_classmethod for name in method_names
-        ):
-            lines.append("")
+                    w(
+                        f"static const mp_rom_obj_static_class_method_t {method.c_name}_obj = {{\n"
+                        f"    {{&{method_type}}}, MP_ROM_PTR(&{method.c_name}_fun_obj)\n"
+                        "};\n"
+                    )
+        if has_wrapped_methods:
+            w("\n")
 
-        lines.append(f"static const mp_rom_map_elem_t {self.c_name}_locals_dict_table[] = {{")
+        w(f"static const mp_rom_map_elem_t {c}_locals_dict_table[] = {{\n")
 
         # Add Final constants to locals dict
         for field in final_fields:
@@ -1150,179 +1304,143 @@ class ClassEmitter:
             if isinstance(value, bool):
                 # Use MP_ROM_PTR with mp_const_true/false to preserve boolean semantics
                 mp_val = "mp_const_true" if value else "mp_const_false"
-                lines.append(f"    {{ MP_ROM_QSTR(MP_QSTR_{field.name}), MP_ROM_PTR({mp_val}) }},")
+                w(f"    {{ MP_ROM_QSTR(MP_QSTR_{field.name}), MP_ROM_PTR({mp_val}) }},\n")
             elif isinstance(value, int):
-                lines.append(f"    {{ MP_ROM_QSTR(MP_QSTR_{field.name}), MP_ROM_INT({value}) }},")
-            elif isinstance(value, str):
-                # Final[str] is not supported - skip
-                pass
+                w(f"    {{ MP_ROM_QSTR(MP_QSTR_{field.name}), MP_ROM_INT({value}) }},\n")
+            # Final[str] is not supported - skip
 
         # ClassVar fields are not yet supported in locals_dict
         # They would require mutable runtime storage which is not implemented
 
         # Add methods
-        for name in method_names:
-            method = all_methods[name]
-            # Check if this method needs a trait wrapper
-            own_method = self._get_own_or_base_method(name)
-            if own_method is not None:
-                # Method is from this class or base - use normal obj
-                lines.append(
-                    f"    {{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&{method.c_name}_obj) }},"
-                )
-            else:
-                # Method from trait - find which trait and use wrapper
-                wrapper_obj = None
-                for trait in self.class_ir.get_all_traits():
-                    if name in trait.get_all_methods():
-                        wrapper_obj = f"{self.c_name}_{name}_from_{trait.c_name}_obj"
-                        break
-                if wrapper_obj:
-                    lines.append(
-                        f"    {{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&{wrapper_obj}) }},"
-                    )
-                else:
-                    # Fallback to original method obj
-                    lines.append(
-                        f"    {{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&{method.c_name}_obj) }},"
-                    )
-        lines.append("};")
-
-        lines.append(
-            f"static MP_DEFINE_CONST_DICT({self.c_name}_locals_dict, {self.c_name}_locals_dict_table);"
+        w(
+            "".join(
+                f"    {{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&{self._locals_method_obj(name)}) }},\n"
+                for name in method_names
+            )
         )
-        lines.append("")
 
-        return lines
+        w(f"}};\nstatic MP_DEFINE_CONST_DICT({c}_locals_dict, {c}_locals_dict_table);\n")
+
+        return [buf.getvalue()]
+
+    def _locals_method_obj(self, name: str) -> str:
+        """Return the C function object to register for a locals-dict method."""
+        # Methods from this class or its base use their own obj; methods
+        # from a trait use this class's wrapper for that trait
+        if self._get_own_or_base_method(name) is None:
+            for trait in self._all_traits:
+                if name in trait.get_all_methods():
+                    return f"{self.c_name}_{name}_from_{trait.c_name}_obj"
+        return f"{self._all_methods[name].c_name}_obj"
 
     def emit_type_definition(self) -> list[str]:
-        lines = []
+        ir = self.class_ir
+        has_next = ir.has_next
+        # One predicate per _TYPE_SLOTS row, in the same order
+        present = (
+            # Traits can't be instantiated - no make_new slot
+            not ir.is_trait,
+            bool(self._fields_with_path or self._all_properties),
+            ir.has_str or ir.has_repr or self._has_dataclass_repr(),
+            self._has_user_comparison_methods() or self._has_dataclass_eq(),
+            ir.has_hash,
+            # iter slot = iternext function; MP_TYPE_FLAG_ITER_IS_ITERNEXT
+            # makes getiter return self
+            has_next,
+            # __iter__ only: use default getiter
+            ir.has_iter and not has_next,
+            ir.base is not None,
+            self._has_locals_dict,
+        )
+        slot_mask = sum(1 << i for i, ok in enumerate(present) if ok)
 
-        slots = []
+        return [
+            _type_definition_template(slot_mask).format(
+                c=self.c_name, name=ir.name, base=ir.base.c_name if ir.base else ""
+            )
+        ]
 
-        # Traits can't be instantiated - don't add make_new slot
-        if not self.class_ir.is_trait:
-            slots.append(f"    make_new, {self.c_name}_make_new")
+    def emit_all(self, cache_dir: Path | None = None) -> str:
+        """Emit all class code.
 
-        if self.class_ir.get_all_fields() or self.class_ir.get_all_properties():
-            slots.append(f"    attr, {self.c_name}_attr")
+        With ``cache_dir``, the result is stored under a hash of the ClassIR and
+        reused on later calls for an identical class, skipping every emit_* step.
+        """
+        if cache_dir is None:
+            return self._emit_all_sections()
+        return self._cached_emit(cache_dir, "all", self._emit_all_sections)
+
+    def _cached_emit(self, cache_dir: Path, section: str, emit: Callable[[], str]) -> str:
+        """Return ``emit()``, reusing a fragment cached for this ClassIR and section."""
+        path = cache_dir / f"{self._cache_key(section)}.cfrag"
+        try:
+            return path.read_text(encoding="utf-8")
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
 
-        # Add print slot when we have a print handler
-        has_user_repr = self.class_ir.has_repr
-        has_user_str = self.class_ir.has_str
-        has_dataclass_repr = (
-            self.class_ir.is_dataclass
-            and self.class_ir.dataclass_info
-            and self.class_ir.dataclass_info.repr_
-            and not has_user_repr
+        code = emit()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial fragment
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(code, encoding="utf-8")
+        os.replace(tmp_path, path)
+        return code
+
+    def _cache_key(self, section: str) -> str:
+        # compiler imports this module, so its fingerprint is imported lazily.
+        # The fingerprint covers the emitter sources, so any change to emitted
+        # code invalidates fragments cached by an older build.
+        from .compiler import _compiler_fingerprint
+
+        digest = hashlib.blake2b(_compiler_fingerprint(), digest_size=16)
+        digest.update(f"{section}:{self.module_c_name}:".encode())
+        digest.update(_canonical_repr(self.class_ir, {}).encode())
+        return digest.hexdigest()
+
+    def _body_sections(self) -> tuple[Callable[[], list[str]], ...]:
+        """Section emitters that follow the struct, in output order."""
+        return (
+            self.emit_attr_handler,
+            self.emit_print_handler,
+            self.emit_binary_op_handler,
+            self.emit_unary_op_handler,
+            self.emit_iter_handlers,
+            self.emit_vtable_instance,
+            self.emit_trait_method_wrappers,
+            self.emit_trait_vtables,
+            self.emit_make_new,
+            self.emit_locals_dict,
+            self.emit_type_definition,
         )
-        if has_user_str or has_user_repr or has_dataclass_repr:
-            slots.append(f"    print, {self.c_name}_print")
-
-        # Add binary_op slot for comparison methods
-        has_binary_op = self._has_user_comparison_methods() or self._has_dataclass_eq()
-        if has_binary_op:
-            slots.append(f"    binary_op, {self.c_name}_binary_op")
-
-        # Add unary_op slot for __hash__
-        if self.class_ir.has_hash:
-            slots.append(f"    unary_op, {self.c_name}_unary_op")
-
-        # Add iter slot for __iter__ and/or __next__
-        is_self_iterator = self.class_ir.has_iter and self.class_ir.has_next
-        if is_self_iterator:
-            # Self-iterator: iter slot = iternext function
-            # Flag MP_TYPE_FLAG_ITER_IS_ITERNEXT makes getiter return self
-            slots.append(f"    iter, {self.c_name}_iternext")
-        elif self.class_ir.has_next:
-            # __next__ only: use ITER_IS_ITERNEXT
-            slots.append(f"    iter, {self.c_name}_iternext")
-        elif self.class_ir.has_iter:
-            # __iter__ only: use default getiter
-            slots.append(f"    iter, {self.c_name}_getiter")
-        if self.class_ir.base:
-            slots.append(f"    parent, &{self.class_ir.base.c_name}_type")
-
-        all_methods = self.class_ir.get_all_methods()
-        method_names = [
-            name
-            for name, method in all_methods.items()
-            if not method.is_property
-            and not name.startswith("_prop_")
-            and (
-                method.is_static
-                or method.is_classmethod
-                or not name.startswith("__")
-                or name in ("__len__", "__getitem__", "__setitem__")
-            )
-        ]
-        # Also check for Final constants and ClassVar fields
-        final_fields = [f for f in self.class_ir.fields if f.is_final and f.final_value is not None]
-        classvar_fields = [f for f in self.class_ir.fields if f.is_classvar and not f.is_final]
-        has_locals = method_names or final_fields or classvar_fields
-        if has_locals:
-            slots.append(f"    locals_dict, &{self.c_name}_locals_dict")
-
-        slots_str = ",\n".join(slots)
-
-        # Determine type flags
-        has_iternext = self.class_ir.has_next
-        if has_iternext:
-            type_flags = "MP_TYPE_FLAG_ITER_IS_ITERNEXT"
-        else:
-            type_flags = "MP_TYPE_FLAG_NONE"
-
-        lines.append("MP_DEFINE_CONST_OBJ_TYPE(")
-        lines.append(f"    {self.c_name}_type,")
-        lines.append(f"    MP_QSTR_{self.class_ir.name},")
-        lines.append(f"    {type_flags},")
-        lines.append(slots_str)
-        lines.append(");")
-        lines.append("")
 
-        return lines
+    @staticmethod
+    def _write_sections(sections: Iterable[Callable[[], list[str]]]) -> str:
+        """Stream each section's parts into one buffer, newline-separated."""
+        buf = io.StringIO()
+        w = buf.write
+        sep = ""
+        for emit in sections:
+            for part in emit():
+                w(sep)
+                w(part)
+                sep = "\n"
+        return buf.getvalue()
+
+    def _emit_all_sections(self) -> str:
+        return self._write_sections(
+            (self.emit_class_constants, self.emit_struct, *self._body_sections())
+        )
 
-    def emit_all(self) -> str:
-        sections: list[str] = []
-
-        sections.extend(self.emit_class_constants())
-        sections.extend(self.emit_struct())
-        sections.extend(self.emit_field_descriptors())
-        sections.extend(self.emit_attr_handler())
-        sections.extend(self.emit_print_handler())
-        sections.extend(self.emit_binary_op_handler())
-        sections.extend(self.emit_unary_op_handler())
-        sections.extend(self.emit_iter_handlers())
-        sections.extend(self.emit_vtable_instance())
-        sections.extend(self.emit_trait_method_wrappers())
-        sections.extend(self.emit_trait_vtables())
-        sections.extend(self.emit_make_new())
-        sections.extend(self.emit_locals_dict())
-        sections.extend(self.emit_type_definition())
-
-        return "\n".join(sections)
-
-    def emit_all_except_struct(self) -> str:
+    def emit_all_except_struct(self, cache_dir: Path | None = None) -> str:
         """Emit all class code except struct definition and constants.
 
         Constants are emitted separately via emit_class_constants() since
-        they must appear before function code that uses them.
+        they must appear before function code that uses them. ``cache_dir``
+        works as in emit_all().
         """
-        sections: list[str] = []
-
-        # NOTE: Do NOT include emit_class_constants() here!
-        # Constants must be emitted BEFORE function code.
-        sections.extend(self.emit_field_descriptors())
-        sections.extend(self.emit_attr_handler())
-        sections.extend(self.emit_print_handler())
-        sections.extend(self.emit_binary_op_handler())
-        sections.extend(self.emit_unary_op_handler())
-        sections.extend(self.emit_iter_handlers())
-        sections.extend(self.emit_vtable_instance())
-        sections.extend(self.emit_trait_method_wrappers())
-        sections.extend(self.emit_trait_vtables())
-        sections.extend(self.emit_make_new())
-        sections.extend(self.emit_locals_dict())
-        sections.extend(self.emit_type_definition())
-
-        return "\n".join(sections)
+        if cache_dir is None:
+            return self._write_sections(self._body_sections())
+        return self._cached_emit(
+            cache_dir, "body", lambda: self._write_sections(self._body_sections())
+        )
@@ -4,10 +4,6 @@ import ast
 import sys
 from pathlib import Path
 
-from mypyc_micropython.compiler import compile_package, compile_to_micropython
-from mypyc_micropython.ir_builder import IRBuilder
-from mypyc_micropython.ir_visualizer import dump_ir
-
 
 def main() -> int:
     parser = argparse.ArgumentParser(
@@ -21,6 +17,10 @@ def main() -> int:
         action="store_true",
         help="Disable strict mypy type checking (enabled by default)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse compiler output cached in this directory across runs",
+    )
     parser.add_argument(
         "--dump-ir",
         choices=["text", "tree", "json"],
@@ -40,12 +40,19 @@ def main() -> int:
     if args.dump_ir:
         return dump_ir_command(source_path, args.dump_ir, args.ir_function)
 
+    # Imported here so --help and argument errors don't pay for loading mypy
+    from mypyc_micropython.compiler import compile_package, compile_to_micropython
+
     output_dir = Path(args.output) if args.output else None
 
     type_check = not args.no_type_check
     if source_path.is_dir():
         result = compile_package(
-            source_path, output_dir, type_check=type_check, strict_type_check=type_check
+            source_path,
+            output_dir,
+            type_check=type_check,
+            strict_type_check=type_check,
+            cache_dir=args.cache_dir,
         )
     else:
         result = compile_to_micropython(
@@ -53,6 +60,7 @@ def main() -> int:
             output_dir,
             type_check=type_check,
             strict_type_check=type_check,
+            cache_dir=args.cache_dir,
         )
 
     if not result.success:
@@ -87,13 +95,18 @@ def dump_ir_command(source_path: Path, format: str, function_name: str | None) -
 
     from mypyc_micropython.compiler import sanitize_name
     from mypyc_micropython.ir import ModuleIR
+    from mypyc_micropython.ir_builder import IRBuilder
+    from mypyc_micropython.ir_visualizer import dump_ir
 
     classes: dict = {}
     for py_file in sorted(source_path.parent.glob("*.py")):
-        sibling_source = py_file.read_text()
-        sibling_tree = ast.parse(sibling_source)
+        # The module being dumped is one of the siblings; reuse its tree
+        if py_file.name == source_path.name:
+            sibling_tree = tree
+        else:
+            sibling_tree = ast.parse(py_file.read_text())
         scanner = IRBuilder(py_file.stem)
-        for node in ast.iter_child_nodes(sibling_tree):
+        for node in sibling_tree.body:
             if isinstance(node, (ast.Import, ast.ImportFrom)):
                 scanner.register_import(node)
             elif isinstance(node, ast.ClassDef):
@@ -102,13 +115,13 @@ def dump_ir_command(source_path: Path, format: str, function_name: str | None) -
 
     builder = IRBuilder(module_name, known_classes=classes)
     builder.prescan_module_constants(tree)
-    for node in ast.iter_child_nodes(tree):
+    for node in tree.body:
         if isinstance(node, (ast.Import, ast.ImportFrom)):
             builder.register_import(node)
 
     module_ir = ModuleIR(name=module_name, c_name=sanitize_name(module_name))
 
-    for node in ast.iter_child_nodes(tree):
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef):
             func_ir = builder.build_function(node)
             module_ir.functions[func_ir.name] = func_ir
@@ -11,12 +11,24 @@ Output structure:
 from __future__ import annotations
 
 import ast
-import re
+import functools
+import hashlib
+import os
+import pickle
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, cast
 
+from .async_emitter import AsyncEmitter
+from .base_emitter import sanitize_name
+from .class_emitter import ClassEmitter
+from .function_emitter import BaseEmitter, FunctionEmitter
+from .generator_emitter import GeneratorEmitter
 from .ir import CType, FuncIR, ModuleIR, RTuple
+from .ir_builder import IRBuilder, MypyTypeInfo
+from .method_emitter import MethodEmitter
+from .module_emitter import ModuleEmitter
 from .type_checker import TypeCheckResult, type_check_file, type_check_package, type_check_source
 
 
@@ -49,6 +61,21 @@ class _ModuleCompileParts:
     used_rtuples: set[RTuple]
     external_libs: dict[str, Any] = field(default_factory=dict)
 
+    def merge(self, other: _ModuleCompileParts) -> None:
+        """Fold another module's code fragments and feature flags into this one."""
+        self.forward_decls.extend(other.forward_decls)
+        self.struct_code.extend(other.struct_code)
+        self.function_code.extend(other.function_code)
+        self.class_code.extend(other.class_code)
+        self.class_constants.extend(other.class_constants)
+
+        self.uses_print |= other.uses_print
+        self.uses_list_opt |= other.uses_list_opt
+        self.uses_builtins |= other.uses_builtins
+        self.uses_checked_div |= other.uses_checked_div
+        self.uses_imports |= other.uses_imports
+        self.used_rtuples.update(other.used_rtuples)
+
 
 @dataclass
 class _PackageSubmodule:
@@ -59,56 +86,6 @@ class _PackageSubmodule:
     children: list[_PackageSubmodule] = field(default_factory=list)  # nested sub-packages
 
 
-C_RESERVED_WORDS = {
-    "auto",
-    "break",
-    "case",
-    "char",
-    "const",
-    "continue",
-    "default",
-    "do",
-    "double",
-    "else",
-    "enum",
-    "extern",
-    "float",
-    "for",
-    "goto",
-    "if",
-    "int",
-    "long",
-    "register",
-    "return",
-    "short",
-    "signed",
-    "sizeof",
-    "static",
-    "struct",
-    "switch",
-    "typedef",
-    "union",
-    "unsigned",
-    "void",
-    "volatile",
-    "while",
-    "inline",
-    "restrict",
-    "_Bool",
-    "_Complex",
-    "_Imaginary",
-}
-
-
-def sanitize_name(name: str) -> str:
-    result = re.sub(r"[^a-zA-Z0-9_]", "_", name)
-    if result and result[0].isdigit():
-        result = "_" + result
-    if result in C_RESERVED_WORDS:
-        result = result + "_"
-    return result
-
-
 def _get_return_type_from_annotation(returns: ast.expr | None) -> CType:
     """Extract CType from a function's return type annotation.
 
@@ -162,6 +139,7 @@ def compile_to_micropython(
     type_check: bool = True,
     strict_type_check: bool = True,
     external_libs: dict[str, Any] | None = None,
+    cache_dir: str | Path | None = None,
 ) -> CompilationResult:
     """Compile typed Python file to MicroPython usermod folder.
 
@@ -170,6 +148,7 @@ def compile_to_micropython(
         output_dir: Output directory for the usermod folder (default: alongside source)
         type_check: Enable mypy type checking before compilation (default: True)
         strict_type_check: Enable strict mypy type checking (default: True)
+        cache_dir: Directory for cached compiler output reused across runs (default: no cache)
 
     Returns:
         CompilationResult with generated C code and any errors
@@ -192,7 +171,33 @@ def compile_to_micropython(
         output_dir = source_path.parent / f"usermod_{module_name}"
     output_dir = Path(output_dir)
 
-    tc_result: TypeCheckResult | None = None
+    source_code = source_path.read_text()
+    cache_path: Path | None = None
+    if cache_dir is not None and external_libs is None:
+        # Type checking runs with follow_imports="skip", so only this file's
+        # source affects the output; sibling modules are not read
+        cache_path = _module_cache_path(
+            Path(cache_dir),
+            b"file",
+            module_name.encode(),
+            f"{type_check}:{strict_type_check}".encode(),
+            source_code.encode(),
+        )
+        cached = _load_cached_module(cache_path)
+        if cached is not None:
+            c_code, tc_result = cached
+            mk_code, cmake_code = _write_usermod(output_dir, module_name, c_code)
+            return CompilationResult(
+                module_name=module_name,
+                c_code=c_code,
+                h_code=None,
+                mk_code=mk_code,
+                cmake_code=cmake_code,
+                success=True,
+                type_check_result=tc_result,
+            )
+
+    tc_result = None
     if type_check:
         tc_result = type_check_file(source_path, strict=strict_type_check)
         if not tc_result.success:
@@ -208,21 +213,19 @@ def compile_to_micropython(
             )
 
     try:
-        source_code = source_path.read_text()
-        c_code = compile_source(
+        # Reuse the file-level check rather than running mypy on the source again
+        c_code = _compile_source(
             source_code,
             module_name,
             type_check=type_check,
             strict=strict_type_check,
             external_libs=external_libs,
+            type_check_result=tc_result,
+            class_cache_dir=_class_cache_dir(cache_dir),
         )
-        mk_code = generate_micropython_mk(module_name)
-        cmake_code = generate_micropython_cmake(module_name)
-
-        output_dir.mkdir(parents=True, exist_ok=True)
-        (output_dir / f"{module_name}.c").write_text(c_code)
-        (output_dir / "micropython.mk").write_text(mk_code)
-        (output_dir / "micropython.cmake").write_text(cmake_code)
+        mk_code, cmake_code = _write_usermod(output_dir, module_name, c_code)
+        if cache_path is not None:
+            _store_cached_module(cache_path, c_code, tc_result)
 
         return CompilationResult(
             module_name=module_name,
@@ -247,6 +250,79 @@ def compile_to_micropython(
         )
 
 
+def _write_usermod(output_dir: Path, module_name: str, c_code: str) -> tuple[str, str]:
+    """Write the usermod folder for a compiled module; return its (mk, cmake) code."""
+    mk_code = generate_micropython_mk(module_name)
+    cmake_code = generate_micropython_cmake(module_name)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _write_if_changed(output_dir / f"{module_name}.c", c_code)
+    _write_if_changed(output_dir / "micropython.mk", mk_code)
+    _write_if_changed(output_dir / "micropython.cmake", cmake_code)
+    return mk_code, cmake_code
+
+
+def _write_if_changed(path: Path, text: str) -> None:
+    """Write text as UTF-8, leaving the file untouched if it already matches.
+
+    Keeping the mtime of unchanged outputs stops make/CMake from rebuilding
+    the firmware after a recompile that produced the same C code.
+    """
+    data = text.encode()
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+
+
+@functools.cache
+def _compiler_fingerprint() -> bytes:
+    """Digest of the compiler's own sources and mypy version.
+
+    Mixed into every module cache key, so output cached by a different
+    compiler build is never reused.
+    """
+    from mypy.version import __version__ as mypy_version
+
+    digest = hashlib.blake2b(mypy_version.encode(), digest_size=16)
+    for path in sorted(Path(__file__).parent.rglob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+def _module_cache_path(cache_dir: Path, *key_parts: bytes) -> Path:
+    digest = hashlib.blake2b(_compiler_fingerprint(), digest_size=16)
+    for part in key_parts:
+        # Length-prefix each part so different splits never collide
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return cache_dir / "modules" / f"{digest.hexdigest()}.pkl"
+
+
+def _class_cache_dir(cache_dir: str | Path | None) -> Path | None:
+    return Path(cache_dir) / "classes" if cache_dir is not None else None
+
+
+def _load_cached_module(path: Path) -> tuple[str, TypeCheckResult | None] | None:
+    try:
+        with path.open("rb") as f:
+            return cast(tuple[str, TypeCheckResult | None], pickle.load(f))
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        # A missing, truncated or incompatible entry is a cache miss
+        return None
+
+
+def _store_cached_module(path: Path, c_code: str, tc_result: TypeCheckResult | None) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so a concurrent reader never sees a partial entry
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(pickle.dumps((c_code, tc_result), protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp_path, path)
+
+
+@functools.lru_cache(maxsize=256)
 def generate_micropython_mk(module_name: str) -> str:
     c_name = sanitize_name(module_name)
     mod_upper = c_name.upper()
@@ -258,6 +334,7 @@ CFLAGS_USERMOD += -I$({mod_upper}_MOD_DIR)
 """
 
 
+@functools.lru_cache(maxsize=256)
 def generate_micropython_cmake(module_name: str) -> str:
     c_name = sanitize_name(module_name)
 
@@ -295,14 +372,8 @@ def _compile_module_parts(
     known_enums: dict[str, Any] | None = None,
     func_class_returns: dict[str, str] | None = None,
     mypy_type_result: TypeCheckResult | None = None,
+    class_cache_dir: Path | None = None,
 ) -> _ModuleCompileParts:
-    from .async_emitter import AsyncEmitter
-    from .class_emitter import ClassEmitter
-    from .function_emitter import BaseEmitter, FunctionEmitter
-    from .generator_emitter import GeneratorEmitter
-    from .ir_builder import IRBuilder, MypyTypeInfo
-    from .method_emitter import MethodEmitter
-
     mypy_types: MypyTypeInfo | None = None
     if mypy_type_result is not None:
         # Use pre-computed package-level type check result (cross-module aware).
@@ -349,70 +420,73 @@ def _compile_module_parts(
     class_code: list[str] = []
     class_constants: list[str] = []  # #define constants for Final class attrs
 
-    uses_print = False
-    uses_list_opt = False
-    uses_builtins = False
-    uses_checked_div = False
-    uses_imports = False
-    used_rtuples: set[RTuple] = set()
-
     # Pre-scan: collect all module-level function names so that functions/classes
     # defined earlier can reference functions defined later as first-class values
     # (e.g., sorted(items, key=my_func) where my_func is defined after the caller).
-    for node in ast.iter_child_nodes(tree):
+    for node in tree.body:
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
             func_c_name = f"{c_name}_{sanitize_name(node.name)}"
             # Extract return type from function annotation
             return_type = _get_return_type_from_annotation(node.returns)
             ir_builder.register_function_name(node.name, func_c_name, return_type)
 
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            ir_builder.register_import(node)
-        elif isinstance(node, ast.Assign):
-            # Register TypeVar assignments: T = TypeVar('T', bound=int)
-            if not ir_builder.register_typevar(node):
-                # Register module-level constants (NAME = literal)
-                ir_builder.register_constant(node)
-        elif isinstance(node, ast.AnnAssign):
-            ir_builder.register_module_var(node)
-        elif isinstance(node, ast.ClassDef):
-            if ir_builder.is_enum_class(node):
-                enum_ir = ir_builder.build_enum(node)
-                module_ir.add_enum(enum_ir)
-            else:
-                class_ir = ir_builder.build_class(node)
-                module_ir.add_class(class_ir)
-        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            func_ir = ir_builder.build_function(node)
-            function_irs.append(func_ir)
-            module_ir.add_function(func_ir)
-
-            # Select appropriate emitter based on function type
-            if func_ir.is_async:
-                emitter: BaseEmitter = AsyncEmitter(func_ir)
-            elif func_ir.is_generator:
-                emitter = GeneratorEmitter(func_ir)
-            else:
-                emitter = FunctionEmitter(func_ir)
-
-            # Generate forward declaration for this function
-            forward_decls.append(emitter.emit_forward_declaration())
-
-            code, _ = emitter.emit()
-            function_code.append(code)
-
-            if func_ir.uses_print:
-                uses_print = True
-            if func_ir.uses_list_opt:
-                uses_list_opt = True
-            if func_ir.uses_builtins:
-                uses_builtins = True
-            if func_ir.uses_checked_div:
-                uses_checked_div = True
-            if func_ir.uses_imports:
-                uses_imports = True
-            used_rtuples.update(func_ir.used_rtuples)
+    def register_assign(node: ast.Assign) -> None:
+        # Register TypeVar assignments: T = TypeVar('T', bound=int)
+        if not ir_builder.register_typevar(node):
+            # Register module-level constants (NAME = literal)
+            ir_builder.register_constant(node)
+
+    def build_class(node: ast.ClassDef) -> None:
+        if ir_builder.is_enum_class(node):
+            module_ir.add_enum(ir_builder.build_enum(node))
+        else:
+            module_ir.add_class(ir_builder.build_class(node))
+
+    def build_function(node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        func_ir = ir_builder.build_function(node)
+        function_irs.append(func_ir)
+        module_ir.add_function(func_ir)
+
+        # Select appropriate emitter based on function type
+        if func_ir.is_async:
+            emitter: BaseEmitter = AsyncEmitter(func_ir)
+        elif func_ir.is_generator:
+            emitter = GeneratorEmitter(func_ir)
+        else:
+            emitter = FunctionEmitter(func_ir)
+
+        # Generate forward declaration for this function
+        forward_decls.append(emitter.emit_forward_declaration())
+
+        code, _ = emitter.emit()
+        function_code.append(code)
+
+    # One lookup on type(node) per top-level statement instead of an
+    # isinstance chain; statements without a handler are skipped.
+    handlers: dict[type[ast.stmt], Callable[[Any], object]] = {
+        ast.Import: ir_builder.register_import,
+        ast.ImportFrom: ir_builder.register_import,
+        ast.Assign: register_assign,
+        ast.AnnAssign: ir_builder.register_module_var,
+        ast.ClassDef: build_class,
+        ast.FunctionDef: build_function,
+        ast.AsyncFunctionDef: build_function,
+    }
+    for node in tree.body:
+        handler = handlers.get(type(node))
+        if handler is not None:
+            handler(node)
+
+    # The emitters record feature flags on each FuncIR, so fold them once
+    # all module-level functions have been emitted.
+    uses_print = any(f.uses_print for f in function_irs)
+    uses_list_opt = any(f.uses_list_opt for f in function_irs)
+    uses_builtins = any(f.uses_builtins for f in function_irs)
+    uses_checked_div = any(f.uses_checked_div for f in function_irs)
+    uses_imports = any(f.uses_imports for f in function_irs)
+    used_rtuples: set[RTuple] = set()
+    for func_ir in function_irs:
+        used_rtuples.update(func_ir.used_rtuples)
 
     module_ir.imported_modules = ir_builder.imported_modules
     module_ir.constants = ir_builder.module_constants
@@ -421,8 +495,6 @@ def _compile_module_parts(
 
     for class_ir in module_ir.get_classes_in_order():
         class_ir.compute_layout()
-
-    for class_ir in module_ir.get_classes_in_order():
         class_emitter = ClassEmitter(class_ir, c_name)
 
         forward_decls.extend(class_emitter.emit_forward_declarations())
@@ -449,8 +521,7 @@ def _compile_module_parts(
                 native_body = ir_builder.build_method_body(method_ir, class_ir, native=True)
                 # Create emitter AFTER build_method_body so max_temp is correct
                 method_emitter = MethodEmitter(method_ir, class_ir)
-                function_code.append(method_emitter.emit_native(native_body))
-                function_code.append("")
+                function_code.extend((method_emitter.emit_native(native_body), ""))
                 continue
 
             needs_native = (
@@ -465,8 +536,7 @@ def _compile_module_parts(
                 native_body = ir_builder.build_method_body(method_ir, class_ir, native=True)
                 # Create emitter AFTER build_method_body so max_temp is correct
                 method_emitter = MethodEmitter(method_ir, class_ir)
-                function_code.append(method_emitter.emit_native(native_body))
-                function_code.append("")
+                function_code.extend((method_emitter.emit_native(native_body), ""))
 
             wrapper_body = None
             if not needs_native:
@@ -474,10 +544,9 @@ def _compile_module_parts(
                 # Create emitter AFTER build_method_body so max_temp is correct
                 method_emitter = MethodEmitter(method_ir, class_ir)
 
-            function_code.append(method_emitter.emit_mp_wrapper(wrapper_body))
-            function_code.append("")
+            function_code.extend((method_emitter.emit_mp_wrapper(wrapper_body), ""))
 
-        class_code.append(class_emitter.emit_all_except_struct())
+        class_code.append(class_emitter.emit_all_except_struct(class_cache_dir))
 
     # Emit all lambda functions generated during function/method building
     # Lambda code must be prepended so _obj symbols are defined before use
@@ -522,6 +591,8 @@ def compile_source(
     type_check: bool = True,
     strict: bool = True,
     external_libs: dict[str, Any] | None = None,
+    type_check_result: TypeCheckResult | None = None,
+    cache_dir: str | Path | None = None,
 ) -> str:
     """Compile typed Python source to MicroPython C code.
 
@@ -530,6 +601,9 @@ def compile_source(
         module_name: Name for the generated module
         type_check: Enable mypy type checking before compilation (default: True)
         strict: Enable strict mypy type checking (default: True)
+        type_check_result: Result of an earlier mypy run on this source; used
+            instead of type checking again (default: None)
+        cache_dir: Directory for cached compiler output reused across runs (default: no cache)
 
     Returns:
         Generated C code as a string
@@ -537,14 +611,57 @@ def compile_source(
     Raises:
         TypeError: If type checking is enabled and type errors are found
     """
-    from .module_emitter import ModuleEmitter
+    if cache_dir is None or external_libs is not None or type_check_result is not None:
+        return _compile_source(
+            source,
+            module_name,
+            type_check=type_check,
+            strict=strict,
+            external_libs=external_libs,
+            type_check_result=type_check_result,
+            class_cache_dir=_class_cache_dir(cache_dir),
+        )
 
+    cache_path = _module_cache_path(
+        Path(cache_dir),
+        b"source",
+        module_name.encode(),
+        f"{type_check}:{strict}".encode(),
+        source.encode(),
+    )
+    cached = _load_cached_module(cache_path)
+    if cached is not None:
+        return cached[0]
+
+    c_code = _compile_source(
+        source,
+        module_name,
+        type_check=type_check,
+        strict=strict,
+        class_cache_dir=_class_cache_dir(cache_dir),
+    )
+    _store_cached_module(cache_path, c_code, None)
+    return c_code
+
+
+def _compile_source(
+    source: str,
+    module_name: str,
+    *,
+    type_check: bool,
+    strict: bool,
+    external_libs: dict[str, Any] | None = None,
+    type_check_result: TypeCheckResult | None = None,
+    class_cache_dir: Path | None = None,
+) -> str:
     parts = _compile_module_parts(
         source,
         module_name,
         type_check=type_check,
         strict=strict,
         external_libs=external_libs,
+        mypy_type_result=type_check_result,
+        class_cache_dir=class_cache_dir,
     )
 
     module_emitter = ModuleEmitter(
@@ -568,16 +685,15 @@ def compile_source(
     )
 
 
-def _extract_module_constants(source: str) -> dict[str, int | float | str | bool | None]:
-    """Extract module-level constants from Python source.
+def _extract_module_constants(tree: ast.Module) -> dict[str, int | float | str | bool | None]:
+    """Extract module-level constants from a parsed module.
 
     Returns a dict mapping constant names to their literal values.
     Only handles simple NAME = literal_value assignments.
     """
     constants: dict[str, int | float | str | bool | None] = {}
-    tree = ast.parse(source)
 
-    for node in ast.iter_child_nodes(tree):
+    for node in tree.body:
         # Handle NAME = literal
         if isinstance(node, ast.Assign) and len(node.targets) == 1:
             target = node.targets[0]
@@ -615,6 +731,7 @@ def _scan_package_recursive(
     accumulated_parts: _ModuleCompileParts,
     sibling_modules: dict[str, str] | None = None,  # maps import name -> C prefix
     pkg_type_results: dict[str, TypeCheckResult] | None = None,
+    class_cache_dir: Path | None = None,
 ) -> list[_PackageSubmodule]:
     """Recursively scan a package directory and compile all .py files and sub-packages.
 
@@ -627,24 +744,26 @@ def _scan_package_recursive(
     """
     submodules: list[_PackageSubmodule] = []
 
-    from .ir_builder import IRBuilder as _IRBuilder
-
     package_classes: dict[str, Any] = {}
     package_enums: dict[str, Any] = {}
     package_constants: dict[str, dict[str, int | float | str | bool | None]] = {}
     package_func_class_returns: dict[str, str] = {}  # func_name -> class return type
-    for py_file in sorted(package_path.glob("*.py")):
-        if py_file.name == "__init__.py":
-            continue
-        source = py_file.read_text()
-        tree = ast.parse(source)
-        scanner = _IRBuilder(sanitize_name(f"{parent_prefix}_{py_file.stem}"))
+
+    # Read and parse each submodule once: both scans share the trees and the
+    # compile loop below reuses the source text
+    py_files = [p for p in sorted(package_path.glob("*.py")) if p.name != "__init__.py"]
+    sources = {py_file: py_file.read_text() for py_file in py_files}
+    trees = {py_file: ast.parse(source) for py_file, source in sources.items()}
+
+    for py_file in py_files:
+        tree = trees[py_file]
+        scanner = IRBuilder(sanitize_name(f"{parent_prefix}_{py_file.stem}"))
 
         # Extract module-level constants
         module_name = f"{parent_prefix}.{py_file.stem}".lstrip(".")
-        package_constants[module_name] = _extract_module_constants(source)
+        package_constants[module_name] = _extract_module_constants(tree)
 
-        for node in ast.iter_child_nodes(tree):
+        for node in tree.body:
             if isinstance(node, (ast.Import, ast.ImportFrom)):
                 scanner.register_import(node)
             elif isinstance(node, ast.ClassDef):
@@ -656,12 +775,8 @@ def _scan_package_recursive(
                     package_classes[class_ir.name] = class_ir
 
     # Second pass: scan function return types that return known classes
-    for py_file in sorted(package_path.glob("*.py")):
-        if py_file.name == "__init__.py":
-            continue
-        source = py_file.read_text()
-        tree = ast.parse(source)
-        for node in ast.iter_child_nodes(tree):
+    for py_file in py_files:
+        for node in trees[py_file].body:
             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 if node.returns and isinstance(node.returns, ast.Name):
                     ret_name = node.returns.id
@@ -669,12 +784,10 @@ def _scan_package_recursive(
                         package_func_class_returns[node.name] = ret_name
 
     # First: compile .py files at this level
-    for py_file in sorted(package_path.glob("*.py")):
-        if py_file.name == "__init__.py":
-            continue
+    for py_file in py_files:
         submodule_name = py_file.stem
         symbol_prefix = sanitize_name(f"{parent_prefix}_{submodule_name}")
-        source = py_file.read_text()
+        source = sources[py_file]
         # Look up pre-computed type check result for this submodule
         sub_type_result: TypeCheckResult | None = None
         if pkg_type_results is not None:
@@ -690,6 +803,7 @@ def _scan_package_recursive(
             known_enums=package_enums,
             func_class_returns=package_func_class_returns,
             mypy_type_result=sub_type_result,
+            class_cache_dir=class_cache_dir,
         )
         submodules.append(
             _PackageSubmodule(
@@ -700,25 +814,19 @@ def _scan_package_recursive(
             )
         )
 
-        accumulated_parts.forward_decls.extend(parts.forward_decls)
-        accumulated_parts.struct_code.extend(parts.struct_code)
-        accumulated_parts.function_code.extend(parts.function_code)
-        accumulated_parts.class_code.extend(parts.class_code)
-        accumulated_parts.class_constants.extend(parts.class_constants)
-
-        accumulated_parts.uses_print = accumulated_parts.uses_print or parts.uses_print
-        accumulated_parts.uses_list_opt = accumulated_parts.uses_list_opt or parts.uses_list_opt
-        accumulated_parts.uses_builtins = accumulated_parts.uses_builtins or parts.uses_builtins
-        accumulated_parts.uses_checked_div = (
-            accumulated_parts.uses_checked_div or parts.uses_checked_div
-        )
-        accumulated_parts.uses_imports = accumulated_parts.uses_imports or parts.uses_imports
-        accumulated_parts.used_rtuples.update(parts.used_rtuples)
+        accumulated_parts.merge(parts)
 
     # Second: recurse into sub-directories with __init__.py
-    for sub_dir in sorted(package_path.iterdir()):
-        if not sub_dir.is_dir():
-            continue
+    # scandir reports directory-ness from the listing itself, so only real
+    # candidates are stat'ed for an __init__.py; hidden dirs and __pycache__
+    # can never be importable sub-packages
+    with os.scandir(package_path) as entries:
+        sub_dirs = sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir() and not entry.name.startswith(".") and entry.name != "__pycache__"
+        )
+    for sub_dir in sub_dirs:
         sub_init = sub_dir / "__init__.py"
         if not sub_init.exists():
             continue
@@ -748,26 +856,10 @@ def _scan_package_recursive(
             strict=strict,
             sibling_modules=sibling_modules,
             mypy_type_result=init_type_result_sub,
+            class_cache_dir=class_cache_dir,
         )
 
-        accumulated_parts.forward_decls.extend(init_parts.forward_decls)
-        accumulated_parts.struct_code.extend(init_parts.struct_code)
-        accumulated_parts.function_code.extend(init_parts.function_code)
-        accumulated_parts.class_code.extend(init_parts.class_code)
-        accumulated_parts.class_constants.extend(init_parts.class_constants)
-
-        accumulated_parts.uses_print = accumulated_parts.uses_print or init_parts.uses_print
-        accumulated_parts.uses_list_opt = (
-            accumulated_parts.uses_list_opt or init_parts.uses_list_opt
-        )
-        accumulated_parts.uses_builtins = (
-            accumulated_parts.uses_builtins or init_parts.uses_builtins
-        )
-        accumulated_parts.uses_checked_div = (
-            accumulated_parts.uses_checked_div or init_parts.uses_checked_div
-        )
-        accumulated_parts.uses_imports = accumulated_parts.uses_imports or init_parts.uses_imports
-        accumulated_parts.used_rtuples.update(init_parts.used_rtuples)
+        accumulated_parts.merge(init_parts)
 
         # Recurse into the sub-package
         children = _scan_package_recursive(
@@ -779,6 +871,7 @@ def _scan_package_recursive(
             accumulated_parts=accumulated_parts,
             sibling_modules=sibling_modules,
             pkg_type_results=sub_pkg_type_results,
+            class_cache_dir=class_cache_dir,
         )
 
         submodules.append(
@@ -800,9 +893,8 @@ def compile_package(
     *,
     type_check: bool = True,
     strict_type_check: bool = True,
+    cache_dir: str | Path | None = None,
 ) -> CompilationResult:
-    from .module_emitter import ModuleEmitter
-
     package_path = Path(package_dir)
 
     if not package_path.exists():
@@ -843,6 +935,35 @@ def compile_package(
     if output_dir is None:
         output_dir = package_path.parent / f"usermod_{module_name}"
     output_dir = Path(output_dir)
+    class_cache_dir = _class_cache_dir(cache_dir)
+
+    cache_path: Path | None = None
+    if cache_dir is not None:
+        # Submodules see each other's classes and constants, so one entry
+        # covers the whole package tree rather than each file separately
+        key_parts: list[bytes] = []
+        for py_file in sorted(package_path.rglob("*.py")):
+            key_parts.append(py_file.relative_to(package_path).as_posix().encode())
+            key_parts.append(py_file.read_bytes())
+        cache_path = _module_cache_path(
+            Path(cache_dir),
+            b"package",
+            module_name.encode(),
+            f"{type_check}:{strict_type_check}".encode(),
+            *key_parts,
+        )
+        cached = _load_cached_module(cache_path)
+        if cached is not None:
+            c_code, _ = cached
+            mk_code, cmake_code = _write_usermod(output_dir, module_name, c_code)
+            return CompilationResult(
+                module_name=module_name,
+                c_code=c_code,
+                h_code=None,
+                mk_code=mk_code,
+                cmake_code=cmake_code,
+                success=True,
+            )
 
     try:
         # Package-level type checking: type-check all files at once so mypy
@@ -864,6 +985,7 @@ def compile_package(
             type_check=type_check and init_type_result is None,
             strict=strict_type_check,
             mypy_type_result=init_type_result,
+            class_cache_dir=class_cache_dir,
         )
 
         # Build sibling modules map: maps import name -> C prefix
@@ -888,6 +1010,7 @@ def compile_package(
             accumulated_parts=parent_parts,
             sibling_modules=sibling_modules,
             pkg_type_results=pkg_type_results,
+            class_cache_dir=class_cache_dir,
         )
 
         module_emitter = ModuleEmitter(
@@ -909,13 +1032,9 @@ def compile_package(
             submodules=submodules,
         )
 
-        mk_code = generate_micropython_mk(module_name)
-        cmake_code = generate_micropython_cmake(module_name)
-
-        output_dir.mkdir(parents=True, exist_ok=True)
-        (output_dir / f"{module_name}.c").write_text(c_code)
-        (output_dir / "micropython.mk").write_text(mk_code)
-        (output_dir / "micropython.cmake").write_text(cmake_code)
+        mk_code, cmake_code = _write_usermod(output_dir, module_name, c_code)
+        if cache_path is not None:
+            _store_cached_module(cache_path, c_code, None)
 
         return CompilationResult(
             module_name=module_name,
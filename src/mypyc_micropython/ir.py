@@ -50,44 +50,17 @@ class CType(Enum):
 
     def to_c_type_str(self) -> str:
         """Return the C type string."""
-        mapping = {
-            CType.MP_OBJ_T: "mp_obj_t",
-            CType.MP_INT_T: "mp_int_t",
-            CType.MP_FLOAT_T: "mp_float_t",
-            CType.BOOL: "bool",
-            CType.VOID: "void",
-            CType.GENERAL: "mp_obj_t",
-        }
-        return mapping[self]
+        return _CTYPE_TO_C_STR[self]
 
     def to_field_type_id(self) -> int:
         """Return the field type ID for attr slot dispatch."""
-        mapping = {
-            CType.MP_OBJ_T: 0,
-            CType.MP_INT_T: 1,
-            CType.MP_FLOAT_T: 2,
-            CType.BOOL: 3,
-            CType.GENERAL: 0,
-        }
-        return mapping.get(self, 0)
+        return _CTYPE_TO_FIELD_TYPE_ID.get(self, 0)
 
     @staticmethod
     def from_python_type(type_str: str) -> CType:
         """Convert Python type annotation string to CType."""
-        mapping = {
-            "int": CType.MP_INT_T,
-            "float": CType.MP_FLOAT_T,
-            "bool": CType.BOOL,
-            "str": CType.MP_OBJ_T,
-            "None": CType.VOID,
-            "list": CType.MP_OBJ_T,
-            "dict": CType.MP_OBJ_T,
-            "tuple": CType.MP_OBJ_T,
-            "object": CType.GENERAL,
-            "Any": CType.GENERAL,
-        }
         base_type = type_str.split("[")[0].strip()
-        return mapping.get(base_type, CType.GENERAL)
+        return _PYTHON_TYPE_TO_CTYPE.get(base_type, CType.GENERAL)
 
     @staticmethod
     def from_c_type_str(c_type: str) -> CType:
@@ -96,14 +69,49 @@ class CType(Enum):
         Unlike from_python_type, this maps 'mp_obj_t' to MP_OBJ_T (not GENERAL),
         since a known C type string indicates the type was explicitly resolved.
         """
-        mapping = {
-            "mp_obj_t": CType.MP_OBJ_T,
-            "mp_int_t": CType.MP_INT_T,
-            "mp_float_t": CType.MP_FLOAT_T,
-            "bool": CType.BOOL,
-            "void": CType.VOID,
-        }
-        return mapping.get(c_type, CType.MP_OBJ_T)
+        return _C_STR_TO_CTYPE.get(c_type, CType.MP_OBJ_T)
+
+
+# Lookup tables for CType conversions. These are hit for every field, param
+# and return type the emitters touch, so they are built once here rather than
+# per call inside the methods above.
+_CTYPE_TO_C_STR: dict[CType, str] = {
+    CType.MP_OBJ_T: "mp_obj_t",
+    CType.MP_INT_T: "mp_int_t",
+    CType.MP_FLOAT_T: "mp_float_t",
+    CType.BOOL: "bool",
+    CType.VOID: "void",
+    CType.GENERAL: "mp_obj_t",
+}
+
+_CTYPE_TO_FIELD_TYPE_ID: dict[CType, int] = {
+    CType.MP_OBJ_T: 0,
+    CType.MP_INT_T: 1,
+    CType.MP_FLOAT_T: 2,
+    CType.BOOL: 3,
+    CType.GENERAL: 0,
+}
+
+_PYTHON_TYPE_TO_CTYPE: dict[str, CType] = {
+    "int": CType.MP_INT_T,
+    "float": CType.MP_FLOAT_T,
+    "bool": CType.BOOL,
+    "str": CType.MP_OBJ_T,
+    "None": CType.VOID,
+    "list": CType.MP_OBJ_T,
+    "dict": CType.MP_OBJ_T,
+    "tuple": CType.MP_OBJ_T,
+    "object": CType.GENERAL,
+    "Any": CType.GENERAL,
+}
+
+_C_STR_TO_CTYPE: dict[str, CType] = {
+    "mp_obj_t": CType.MP_OBJ_T,
+    "mp_int_t": CType.MP_INT_T,
+    "mp_float_t": CType.MP_FLOAT_T,
+    "bool": CType.BOOL,
+    "void": CType.VOID,
+}
 
 @dataclass
 class RTuple:
@@ -233,6 +241,9 @@ class MethodIR:
     docstring: str | None = None
     max_temp: int = 0
     defaults: dict[int, DefaultArg] = field(default_factory=dict)  # param_index -> default
+    owner_c_name: str = ""  # C name of the defining class ("" if not attached)
+    # __next__ signals exhaustion by returning MP_OBJ_STOP_ITERATION, not raising
+    returns_stop_iteration_sentinel: bool = False
 
     @property
     def num_required_args(self) -> int:
@@ -590,23 +601,21 @@ class IRType(Enum):
     BOOL = auto()  # bool
 
     def to_c_type_str(self) -> str:
-        mapping = {
-            IRType.OBJ: "mp_obj_t",
-            IRType.INT: "mp_int_t",
-            IRType.FLOAT: "mp_float_t",
-            IRType.BOOL: "bool",
-        }
-        return mapping[self]
+        return _IRTYPE_TO_C_STR[self]
 
     @staticmethod
     def from_c_type_str(c_type: str) -> IRType:
-        mapping = {
-            "mp_obj_t": IRType.OBJ,
-            "mp_int_t": IRType.INT,
-            "mp_float_t": IRType.FLOAT,
-            "bool": IRType.BOOL,
-        }
-        return mapping.get(c_type, IRType.OBJ)
+        return _C_STR_TO_IRTYPE.get(c_type, IRType.OBJ)
+
+
+_IRTYPE_TO_C_STR: dict[IRType, str] = {
+    IRType.OBJ: "mp_obj_t",
+    IRType.INT: "mp_int_t",
+    IRType.FLOAT: "mp_float_t",
+    IRType.BOOL: "bool",
+}
+
+_C_STR_TO_IRTYPE: dict[str, IRType] = {v: k for k, v in _IRTYPE_TO_C_STR.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -1682,6 +1691,8 @@ class RaiseIR(StmtIR):
     exc_msg: ValueNode | None = None  # Message argument (if any)
     is_reraise: bool = False  # True for bare 'raise' (re-raise current)
     prelude: list[InstrNode] = field(default_factory=list)
+    # Lowered to 'return MP_OBJ_STOP_ITERATION;' inside a sentinel __next__
+    as_stop_iteration_sentinel: bool = False
 
 
 @dataclass
@@ -8,6 +8,7 @@ The IR is then consumed by emitters to generate C code.
 from __future__ import annotations
 
 import ast
+import sys
 import warnings
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
@@ -149,12 +150,57 @@ class BuildContext:
     locals_: list[str]
     class_ir: ClassIR | None = None
     native: bool = False
+    # Lower bare 'raise StopIteration' to a sentinel return (see MethodIR)
+    stop_iteration_sentinel: bool = False
 
     @property
     def is_method(self) -> bool:
         return self.class_ir is not None
 
 
+def _can_return_stop_sentinel(node: ast.FunctionDef) -> bool:
+    """Check whether __next__ can report exhaustion by returning a sentinel.
+
+    Only bodies with no calls (other than an argument-less StopIteration()),
+    no try/with blocks and no nested scopes qualify: nothing else in them can
+    raise StopIteration, or catch the one they raise, so the iternext slot does
+    not need an NLR frame to translate it. StopIteration("msg") is not lowered
+    to the sentinel, so it counts as an ordinary call and disqualifies the body.
+    """
+    stop_calls: set[int] = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Raise) and isinstance(child.exc, ast.Call):
+            exc = child.exc
+            if (
+                isinstance(exc.func, ast.Name)
+                and exc.func.id == "StopIteration"
+                and not exc.args
+                and not exc.keywords
+            ):
+                stop_calls.add(id(exc))
+    for child in ast.walk(node):
+        if child is node:
+            continue
+        if isinstance(child, ast.Call) and id(child) not in stop_calls:
+            return False
+        if isinstance(
+            child,
+            (
+                ast.Try,
+                ast.TryStar,
+                ast.With,
+                ast.AsyncWith,
+                ast.Lambda,
+                ast.FunctionDef,
+                ast.AsyncFunctionDef,
+                ast.ClassDef,
+                ast.Await,
+            ),
+        ):
+            return False
+    return True
+
+
 @dataclass
 class MypyTypeInfo:
     """Container for mypy type information passed to IRBuilder."""
@@ -916,6 +962,8 @@ class IRBuilder:
         elif isinstance(stmt.exc, ast.Name):
             exc_type = stmt.exc.id
 
+        if exc_type == "StopIteration" and exc_msg is None and self._ctx.stop_iteration_sentinel:
+            return RaiseIR(exc_type=exc_type, as_stop_iteration_sentinel=True)
         return RaiseIR(exc_type=exc_type, exc_msg=exc_msg, prelude=prelude)
 
     def _build_for(self, stmt: ast.For, locals_: list[str]) -> ForRangeIR | ForIterIR:
@@ -3496,7 +3544,8 @@ class IRBuilder:
     def build_class(self, node: ast.ClassDef) -> ClassIR:
         """Build ClassIR from ast.ClassDef."""
         class_name = node.name
-        c_class_name = f"{self.c_name}_{sanitize_name(class_name)}"
+        # Interned: every emitter pastes this into dozens of derived identifiers
+        c_class_name = sys.intern(f"{self.c_name}_{sanitize_name(class_name)}")
 
         # Check for dataclass, @final, and @trait decorators
         # Supports: @trait, @mypy_extensions.trait, from mypy_extensions import trait
@@ -3894,7 +3943,7 @@ class IRBuilder:
         defaults = self._parse_defaults(node.args, len(params))
         method_ir = MethodIR(
             name=method_name,
-            c_name=c_method_name,
+            c_name=sys.intern(c_method_name),
             params=params,
             return_type=return_type,
             body_ast=node,
@@ -3907,6 +3956,10 @@ class IRBuilder:
             is_final=is_final,
             docstring=ast.get_docstring(node),
             defaults=defaults,
+            owner_c_name=class_ir.c_name,
+            returns_stop_iteration_sentinel=(
+                method_name == "__next__" and not is_final and _can_return_stop_sentinel(node)
+            ),
         )
 
         if is_property and is_property_setter and property_name is not None:
@@ -4018,7 +4071,12 @@ class IRBuilder:
         if not method_ir.is_static and not method_ir.is_classmethod:
             local_vars.insert(0, "self")
 
-        self._ctx = BuildContext(locals_=local_vars, class_ir=class_ir, native=native)
+        self._ctx = BuildContext(
+            locals_=local_vars,
+            class_ir=class_ir,
+            native=native,
+            stop_iteration_sentinel=method_ir.returns_stop_iteration_sentinel and not native,
+        )
         body_ir: list[StmtNode] = []
         for stmt in method_ir.body_ast.body:
             # Skip docstrings
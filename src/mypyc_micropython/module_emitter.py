@@ -54,6 +54,11 @@ class ModuleEmitter:
         class_code: list[str],
         functions: list[FuncIR],
     ) -> str:
+        """Assemble the module's C file.
+
+        Every code argument is a list of finished fragments; they are gathered
+        into one list of lines and joined exactly once at the end.
+        """
         lines: list[str] = []
         module_var_entries = self._collect_module_var_entries()
         module_init_name = f"{self.c_name}__module_init"
@@ -100,14 +105,15 @@ class ModuleEmitter:
             lines.extend(class_constants)
             lines.append("")
 
-        for func_code in function_code:
-            if module_var_entries:
-                lines.append(self._inject_module_init_call(func_code, module_init_name))
-            else:
-                lines.append(func_code)
+        if module_var_entries:
+            lines.extend(
+                self._inject_module_init_call(func_code, module_init_name)
+                for func_code in function_code
+            )
+        else:
+            lines.extend(function_code)
 
-        for cls_code in class_code:
-            lines.append(cls_code)
+        lines.extend(class_code)
 
         lines.extend(self._emit_globals_table(functions))
         lines.extend(self._emit_module_registration())
@@ -189,14 +195,15 @@ class ModuleEmitter:
             lines.extend(class_constants)
             lines.append("")
 
-        for func_code in function_code:
-            if module_var_entries:
-                lines.append(self._inject_module_init_call(func_code, module_init_name))
-            else:
-                lines.append(func_code)
+        if module_var_entries:
+            lines.extend(
+                self._inject_module_init_call(func_code, module_init_name)
+                for func_code in function_code
+            )
+        else:
+            lines.extend(function_code)
 
-        for cls_code in class_code:
-            lines.append(cls_code)
+        lines.extend(class_code)
 
         # Emit all submodule globals tables recursively (depth-first)
         self._emit_submodules_recursive(lines, submodules)
@@ -280,6 +287,7 @@ class ModuleEmitter:
             '#include "py/obj.h"',
             '#include "py/objtype.h"',
             "#include <stddef.h>",
+            "#include <string.h>",
         ]
         if self._uses_print:
             lines.append('#include "py/mpprint.h"')
@@ -16,6 +16,8 @@ Usage:
 
 from __future__ import annotations
 
+import copy
+import functools
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -171,6 +173,22 @@ def type_check_source(
         >>> result.functions["add"].return_type
         'int'
     """
+    # Hand out a copy so callers may modify it without affecting the cache
+    return copy.deepcopy(
+        _type_check_source_cached(source, module_name, python_version, strict, check_untyped)
+    )
+
+
+# mypy dominates compile time; identical inputs within one process (repeat
+# builds, test suites) reuse the earlier result. The public wrappers copy it.
+@functools.lru_cache(maxsize=128)
+def _type_check_source_cached(
+    source: str,
+    module_name: str,
+    python_version: tuple[int, int],
+    strict: bool,
+    check_untyped: bool,
+) -> TypeCheckResult:
     # Create temporary file for mypy (it needs a file path)
     with tempfile.NamedTemporaryFile(
         mode="w", suffix=".py", delete=False, prefix=f"{module_name}_"
@@ -210,8 +228,24 @@ def type_check_file(
             errors=[f"File not found: {file_path}"],
         )
 
-    module_name = file_path.stem
-    return _run_type_check(str(file_path), module_name, python_version, strict, check_untyped)
+    # imports are not followed, so the file's own bytes fully determine the result
+    return copy.deepcopy(
+        _type_check_file_cached(
+            str(file_path), file_path.read_bytes(), python_version, strict, check_untyped
+        )
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _type_check_file_cached(
+    file_path: str,
+    content: bytes,
+    python_version: tuple[int, int],
+    strict: bool,
+    check_untyped: bool,
+) -> TypeCheckResult:
+    module_name = Path(file_path).stem
+    return _run_type_check(file_path, module_name, python_version, strict, check_untyped)
 
 
 def type_check_package(
@@ -1290,42 +1290,44 @@ static inline size_t mp_mock_dict_len(mp_obj_t dict_obj) {
 #include <setjmp.h>
 
 typedef struct _nlr_buf_t {
+    struct _nlr_buf_t *prev;
     jmp_buf buf;
     void *ret_val;
 } nlr_buf_t;
 
 static __thread nlr_buf_t *_nlr_top = NULL;
 
-static inline int nlr_push(nlr_buf_t *nlr) {
+static inline void mp_mock_nlr_enter(nlr_buf_t *nlr) {
     nlr->ret_val = NULL;
-    nlr_buf_t *prev = _nlr_top;
+    nlr->prev = _nlr_top;
     _nlr_top = nlr;
-    int r = setjmp(nlr->buf);
-    if (r != 0) {
-        _nlr_top = prev;
-    }
-    return r;
 }
 
+/* setjmp must run in the caller's frame, so nlr_push has to be a macro
+ * (as it is in MicroPython); nlr_jump unlinks the frame before jumping. */
+#define nlr_push(nlr) (mp_mock_nlr_enter(nlr), setjmp((nlr)->buf))
+
 static inline void nlr_pop(void) {
     if (_nlr_top != NULL) {
-        nlr_buf_t *prev = (nlr_buf_t *)((char *)_nlr_top - sizeof(nlr_buf_t));
-        _nlr_top = (_nlr_top == prev) ? NULL : prev;
+        _nlr_top = _nlr_top->prev;
     }
 }
 
 __attribute__((noreturn))
 static inline void nlr_jump(void *val) {
-    if (_nlr_top == NULL) {
+    nlr_buf_t *top = _nlr_top;
+    if (top == NULL) {
         mp_mock_abort("nlr_jump called with no nlr_push");
     }
-    _nlr_top->ret_val = val;
-    longjmp(_nlr_top->buf, 1);
+    _nlr_top = top->prev;
+    top->ret_val = val;
+    longjmp(top->buf, 1);
 }
 
 #define MP_MOCK_TAG_EXCEPTION (0xE4CE97)
 
 typedef struct {
+    mp_obj_base_t base;  /* type points at the mp_type_* below, as in MicroPython */
     int tag;
     int exc_type;
     char *message;
@@ -1371,6 +1373,7 @@ static int mp_type_AssertionError MP_UNUSED = MP_EXC_TYPE_ASSERTION_ERROR;
 
 static inline mp_obj_t mp_obj_new_exception_msg(int *exc_type, const char *msg) {
     mp_obj_exception_struct *exc = (mp_obj_exception_struct *)malloc(sizeof(mp_obj_exception_struct));
+    exc->base.type = (mp_obj_t)exc_type;
     exc->tag = MP_MOCK_TAG_EXCEPTION;
     exc->exc_type = *exc_type;
     exc->message = msg ? strdup(msg) : NULL;
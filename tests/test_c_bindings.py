@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
 from mypyc_micropython.c_bindings.core.c_emitter import CEmitter
 from mypyc_micropython.c_bindings.core.c_ir import CType
+from mypyc_micropython.c_bindings.core.compiler import CBindingCompiler
 from mypyc_micropython.c_bindings.core.stub_parser import StubParser
 
 
@@ -73,6 +77,32 @@ class Widget:
         assert struct.is_opaque is True
         assert struct.fields == {}
 
+    def test_parse_docstrings(self):
+        source = '''
+@c_struct("widget_t")
+class Widget:
+    """Opaque widget.
+
+        Indented detail.
+    """
+
+@c_enum("mode_t")
+class Mode:
+    A: int = 0
+
+def draw(w: c_ptr[Widget]) -> None:
+    """Draw a widget."""
+
+def clear() -> None: ...
+'''
+        library = StubParser().parse_source(source, "mod")
+
+        assert library.docstring is None
+        assert library.structs["Widget"].docstring == "Opaque widget.\n\nIndented detail."
+        assert library.enums["Mode"].docstring is None
+        assert library.functions["draw"].docstring == "Draw a widget."
+        assert library.functions["clear"].docstring is None
+
     def test_parse_struct_non_opaque_fields(self):
         source = """
 @c_struct("event_t", opaque=False)
@@ -103,6 +133,39 @@ class EventCode:
         assert enum.c_name == "event_code_t"
         assert enum.values == {"CLICK": 1, "READY": 16, "MIXED": 3}
 
+    def test_parse_enum_long_flag_chain_and_unsupported_ops(self):
+        flags = " | ".join(f"(1 << {i})" for i in range(200))
+        source = f"""
+@c_enum("flag_t")
+class Flag:
+    ALL: int = {flags}
+    MASK: int = (0xFF << 8) - 1 & 0xF0F0
+    DIV: int = (1 << 4) // WIDTH
+    NEG: int = -1
+"""
+        library = StubParser().parse_source(source, "mod")
+        enum = library.enums["Flag"]
+
+        assert enum.values["ALL"] == (1 << 200) - 1
+        assert enum.values["MASK"] == ((0xFF << 8) - 1) & 0xF0F0
+        assert "DIV" not in enum.values
+        assert enum.values["NEG"] == -1
+
+    def test_parse_enum_values_keep_order_and_drop_invalid(self):
+        source = """
+@c_enum("state_t")
+class State:
+    A: int = 1 << 2
+    BAD_SHIFT: int = 1 << (0 - 1)
+    B: int = 7
+    CALL: int = 1 << len("xx")
+    C: int = (1 << 3) | (1 << 0)
+"""
+        library = StubParser().parse_source(source, "mod")
+        enum = library.enums["State"]
+
+        assert list(enum.values.items()) == [("A", 4), ("B", 7), ("C", 9)]
+
     def test_parse_callback_alias(self):
         source = """
 @c_struct("event_t")
@@ -147,6 +210,64 @@ def set_parent(node: c_ptr[Node], parent: c_ptr[Node] | None) -> None: ...
         assert func.params[1].type_def.struct_name == "Node"
         assert func.params[1].type_def.is_optional is True
 
+    def test_parse_primitive_annotations_share_typedefs(self):
+        source = """
+def first(a: c_int, b: c_int | None) -> c_int: ...
+def second(a: c_int) -> None: ...
+"""
+        library = StubParser().parse_source(source, "mod")
+        first = library.functions["first"]
+        second = library.functions["second"]
+
+        assert first.params[0].type_def is second.params[0].type_def
+        assert first.params[0].type_def is first.return_type
+        assert first.params[0].type_def.is_optional is False
+        assert first.params[1].type_def.base_type == CType.INT
+        assert first.params[1].type_def.is_optional is True
+
+    def test_parse_repeated_pointer_annotations_share_typedefs(self):
+        source = """
+@c_struct("node_t")
+class Node: ...
+
+def link(a: c_ptr[Node], b: c_ptr[Node] | None, c: c_ptr[Node] | None) -> c_ptr[Node]: ...
+"""
+        library = StubParser().parse_source(source, "mod")
+        func = library.functions["link"]
+        a, b, c = (p.type_def for p in func.params)
+
+        assert a is func.return_type
+        assert a.is_optional is False
+        assert b is c
+        assert b.struct_name == "Node"
+        assert b.is_optional is True
+
+    def test_parse_bare_struct_name_resolves_against_declared_structs(self):
+        source = """
+def before(e: Event) -> None: ...
+
+@c_struct("event_t", opaque=False)
+class Event:
+    code: c_int
+
+def after(e: Event) -> None: ...
+"""
+        library = StubParser().parse_source(source, "mod")
+
+        assert library.functions["before"].params[0].type_def.base_type == CType.STRUCT_PTR
+        assert library.functions["after"].params[0].type_def.base_type == CType.STRUCT_VAL
+
+    def test_parse_non_optional_union_uses_left_type(self):
+        source = """
+def pick(value: c_int | c_float, maybe: None | c_int) -> None: ...
+"""
+        library = StubParser().parse_source(source, "mod")
+        value, maybe = (p.type_def for p in library.functions["pick"].params)
+
+        assert value.base_type == CType.INT
+        assert value.is_optional is False
+        assert maybe.base_type == CType.VOID
+
     def test_parse_vararg_function(self):
         source = """
 def log(fmt: c_str, *args: c_int) -> None: ...
@@ -158,6 +279,20 @@ def log(fmt: c_str, *args: c_int) -> None: ...
         assert len(func.params) == 1
         assert func.params[0].name == "fmt"
 
+    def test_parse_file_reads_stub_bytes(self, tmp_path: Path):
+        stub = tmp_path / "sensor.pyi"
+        stub.write_bytes(
+            '# -*- coding: utf-8 -*-\n"""Capteur de température."""\n'
+            '__c_header__ = "sensor.h"\n'
+            "def read() -> c_int: ...\n".encode()
+        )
+        library = StubParser().parse_file(stub)
+
+        assert library.name == "sensor"
+        assert library.docstring == "Capteur de température."
+        assert library.header == "sensor.h"
+        assert "read" in library.functions
+
 
 class TestCEmitter:
     def test_emit_function_wrapper_int_and_return(self):
@@ -316,3 +451,27 @@ def set_cb(obj: c_ptr[GfxObj], cb: Callable[[c_ptr[GfxObj]], None], user_data: c
         assert "gfx_cb_registry" in c_code
         assert "MP_REGISTER_ROOT_POINTER(mp_obj_t *gfx_cb_root);" in c_code
         assert "MP_REGISTER_MODULE(MP_QSTR_gfx, gfx_user_cmodule);" in c_code
+
+    def test_compile_stub_skips_rewriting_unchanged_output(self, tmp_path: Path):
+        stub = tmp_path / "gfx.pyi"
+        stub.write_text('__c_header__ = "gfx.h"\n\ndef clear() -> None: ...\n')
+        out_dir = tmp_path / "out"
+        compiler = CBindingCompiler()
+
+        first = compiler.compile_stub(stub, out_dir)
+        c_path = out_dir / "gfx.c"
+        cmake_path = out_dir / "micropython.cmake"
+        assert first.success
+        assert c_path.read_text() == first.c_code
+        assert cmake_path.read_text() == first.cmake_code
+
+        os.utime(c_path, ns=(0, 0))
+        os.utime(cmake_path, ns=(0, 0))
+        compiler.compile_stub(stub, out_dir)
+        assert c_path.stat().st_mtime_ns == 0
+        assert cmake_path.stat().st_mtime_ns == 0
+
+        stub.write_text('__c_header__ = "gfx.h"\n\ndef flush() -> None: ...\n')
+        compiler.compile_stub(stub, out_dir)
+        assert c_path.stat().st_mtime_ns != 0
+        assert "flush" in c_path.read_text()
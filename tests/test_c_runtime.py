@@ -603,6 +603,76 @@ int main(void) {
     assert stdout.strip() == "13"
 
 
+@pytest.mark.parametrize("stop", ["StopIteration", "StopIteration()"])
+def test_c_next_returning_stop_sentinel_ends_iteration(compile_and_run, stop):
+    """A self-contained __next__ returns MP_OBJ_STOP_ITERATION without an NLR frame."""
+    source = f"""
+class Countdown:
+    count: int
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def __next__(self) -> int:
+        if self.count <= 0:
+            raise {stop}
+        self.count -= 1
+        return self.count + 1
+"""
+    test_main_c = """
+#include <stdio.h>
+int main(void) {
+    mp_obj_t args[1] = {mp_obj_new_int(3)};
+    mp_obj_t it = test_Countdown_make_new(&test_Countdown_type, 1, 0, args);
+    for (;;) {
+        mp_obj_t item = test_Countdown_iternext(it);
+        if (item == MP_OBJ_STOP_ITERATION) {
+            break;
+        }
+        printf("%ld\\n", (long)mp_obj_get_int(item));
+    }
+    printf("%d\\n", test_Countdown_iternext(it) == MP_OBJ_STOP_ITERATION);
+    return 0;
+}
+"""
+    stdout = compile_and_run(source, "test", test_main_c)
+    assert stdout.strip().splitlines() == ["3", "2", "1", "1"]
+
+
+def test_c_next_with_stop_iteration_message_ends_iteration(compile_and_run):
+    source = """
+class Countdown:
+    count: int
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def __next__(self) -> int:
+        if self.count <= 0:
+            raise StopIteration("done")
+        self.count -= 1
+        return self.count + 1
+"""
+    test_main_c = """
+#include <stdio.h>
+int main(void) {
+    mp_obj_t args[1] = {mp_obj_new_int(3)};
+    mp_obj_t it = test_Countdown_make_new(&test_Countdown_type, 1, 0, args);
+    for (;;) {
+        mp_obj_t item = test_Countdown_iternext(it);
+        if (item == MP_OBJ_STOP_ITERATION) {
+            break;
+        }
+        printf("%ld\\n", (long)mp_obj_get_int(item));
+    }
+    printf("%d\\n", test_Countdown_iternext(it) == MP_OBJ_STOP_ITERATION);
+    return 0;
+}
+"""
+    stdout = compile_and_run(source, "test", test_main_c)
+    assert stdout.strip().splitlines() == ["3", "2", "1", "1"]
+
+
 def test_c_optional_is_not_none_guard(compile_and_run):
     source = """
 class Point:
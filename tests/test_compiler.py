@@ -1,5 +1,6 @@
 """Tests for the mypyc-micropython compiler."""
 
+import os
 import tempfile
 from pathlib import Path
 
@@ -33,6 +34,9 @@ class TestSanitizeName:
     def test_empty_name(self):
         assert sanitize_name("") == ""
 
+    def test_non_ascii_identifier(self):
+        assert sanitize_name("café") == "caf_"
+
 
 class TestCompileSource:
     """Tests for the compile_source function."""
@@ -450,6 +454,68 @@ class TestCompileToMicropython:
             assert "target_include_directories" in result.cmake_code
             assert "target_link_libraries" in result.cmake_code
 
+    def test_unchanged_output_files_are_not_rewritten(self, tmp_path):
+        source_path = tmp_path / "mymod.py"
+        source_path.write_text("def x() -> int:\n    return 0\n")
+        c_path = tmp_path / "usermod_mymod" / "mymod.c"
+
+        compile_to_micropython(source_path, type_check=False)
+        os.utime(c_path, ns=(0, 0))
+        compile_to_micropython(source_path, type_check=False)
+        assert c_path.stat().st_mtime_ns == 0
+
+        source_path.write_text("def x() -> int:\n    return 1\n")
+        result = compile_to_micropython(source_path, type_check=False)
+        assert c_path.stat().st_mtime_ns != 0
+        assert c_path.read_text() == result.c_code
+
+    def test_type_checks_the_file_only_once(self, tmp_path, monkeypatch):
+        from mypyc_micropython import compiler
+
+        def fail(*args, **kwargs):
+            raise AssertionError("source was type checked a second time")
+
+        monkeypatch.setattr(compiler, "type_check_source", fail)
+        source_path = tmp_path / "mymod.py"
+        source_path.write_text("def x(a: int) -> int:\n    return a + 1\n")
+        result = compile_to_micropython(source_path)
+        assert result.success is True
+        assert result.type_check_result is not None
+        assert "mymod_x" in result.c_code
+
+    def test_cache_dir_skips_unchanged_source(self, tmp_path, monkeypatch):
+        from mypyc_micropython import compiler
+
+        source_path = tmp_path / "mymod.py"
+        source_path.write_text("def x() -> int:\n    return 0\n")
+        cache_dir = tmp_path / "cache"
+        first = compile_to_micropython(source_path, cache_dir=cache_dir)
+        assert first.success is True
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cache hit should skip type checking")
+
+        monkeypatch.setattr(compiler, "type_check_file", fail)
+        (tmp_path / "usermod_mymod" / "mymod.c").unlink()
+        second = compile_to_micropython(source_path, cache_dir=cache_dir)
+        assert second.success is True
+        assert second.c_code == first.c_code
+        assert second.type_check_result == first.type_check_result
+        assert (tmp_path / "usermod_mymod" / "mymod.c").read_text() == first.c_code
+
+    def test_cache_dir_treats_corrupt_entry_as_miss(self, tmp_path):
+        source_path = tmp_path / "mymod.py"
+        source_path.write_text("def x() -> int:\n    return 0\n")
+        cache_dir = tmp_path / "cache"
+        first = compile_to_micropython(source_path, cache_dir=cache_dir)
+        (entry,) = (cache_dir / "modules").glob("*.pkl")
+        for garbage in (b"", b"not a pickle", entry.read_bytes()[:10]):
+            entry.write_bytes(garbage)
+            second = compile_to_micropython(source_path, cache_dir=cache_dir)
+            assert second.success is True
+            assert second.c_code == first.c_code
+        assert list((cache_dir / "modules").glob("*")) == [entry]
+
 
 class TestCompilePackage:
     def test_compile_sensor_lib_package(self):
@@ -585,6 +651,31 @@ class TestCompilePackage:
             assert "MP_QSTR_sub), MP_ROM_PTR(&mypkg_sub_module)" in result.c_code
             assert "MP_REGISTER_MODULE(MP_QSTR_mypkg, mypkg_user_cmodule);" in result.c_code
 
+    def test_cache_dir_skips_unchanged_package(self, tmp_path, monkeypatch):
+        from mypyc_micropython import compiler
+
+        pkg_dir = tmp_path / "mypkg"
+        sub_dir = pkg_dir / "sub"
+        sub_dir.mkdir(parents=True)
+        (pkg_dir / "__init__.py").write_text("def version() -> int:\n    return 1\n")
+        (sub_dir / "__init__.py").write_text("def info() -> int:\n    return 2\n")
+        cache_dir = tmp_path / "cache"
+        first = compile_package(pkg_dir, type_check=False, cache_dir=cache_dir)
+        assert first.success is True
+
+        def fail(*args, **kwargs):
+            raise AssertionError("cache hit should skip compilation")
+
+        monkeypatch.setattr(compiler, "_compile_module_parts", fail)
+        second = compile_package(pkg_dir, type_check=False, cache_dir=cache_dir)
+        assert second.success is True
+        assert second.c_code == first.c_code
+
+        # Editing a nested file invalidates the package entry
+        (sub_dir / "__init__.py").write_text("def info() -> int:\n    return 3\n")
+        third = compile_package(pkg_dir, type_check=False, cache_dir=cache_dir)
+        assert third.success is False
+
 
 class TestArithmeticOperations:
     """Tests for arithmetic operation translation."""
@@ -2279,6 +2370,83 @@ class App:
             "test_App___init___obj, 2, 4" in result
         )  # 2 min (self + model0), 4 max (self + 3 params)
 
+    def test_make_new_zeroes_adjacent_pod_fields_with_memset(self):
+        source = """
+class Sample:
+    x: int
+    y: float
+    ok: bool
+    label: object
+    count: int
+
+    def __init__(self) -> None:
+        self.count = 1
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert (
+            "memset(&self->x, 0, offsetof(test_Sample_obj_t, ok) + sizeof(self->ok) - "
+            "offsetof(test_Sample_obj_t, x));" in result
+        )
+        assert "self->x = 0;" not in result
+        # mp_const_none is not all zero bits, and a lone int is not worth a memset
+        assert "self->label = mp_const_none;" in result
+        assert "self->count = 0;" in result
+
+    def test_cache_dir_stores_class_and_module_output(self, tmp_path):
+        source = """
+class Point:
+    x: int
+
+    def __init__(self, x: int) -> None:
+        self.x = x
+"""
+        first = compile_source(source, "test", type_check=False, cache_dir=tmp_path)
+        assert len(list((tmp_path / "classes").glob("*.cfrag"))) == 1
+        (entry,) = (tmp_path / "modules").glob("*.pkl")
+        second = compile_source(source, "test", type_check=False, cache_dir=tmp_path)
+        assert first == second == compile_source(source, "test", type_check=False)
+        assert list((tmp_path / "modules").glob("*.pkl")) == [entry]
+
+    def test_class_cache_key_ignores_hash_seed(self, tmp_path):
+        """ClassIR holds sets (mp_slots), which must not leak hash order into the key."""
+        import shutil
+        import subprocess
+        import sys
+
+        script = f"""
+from mypyc_micropython.compiler import compile_source
+source = '''
+class Counter:
+    count: int
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def __repr__(self) -> str:
+        return "Counter"
+
+    def __eq__(self, other: object) -> bool:
+        return False
+
+    def __iter__(self) -> "Counter":
+        return self
+
+    def __next__(self) -> int:
+        raise StopIteration()
+'''
+compile_source(source, "test", type_check=False, cache_dir={str(tmp_path)!r})
+"""
+        for seed in ("1", "2", "3"):
+            # Drop the module cache so every run emits the class again
+            shutil.rmtree(tmp_path / "modules", ignore_errors=True)
+            subprocess.run(
+                [sys.executable, "-c", script],
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            )
+        assert len(list((tmp_path / "classes").glob("*.cfrag"))) == 1
+
+
 class TestStaticMethod:
     def test_basic_static_method(self):
         source = """
@@ -2475,6 +2643,28 @@ class Temperature:
         assert "Temperature_celsius_native" in result
         assert "celsius_setter" in result.lower() or "_celsius_setter" in result.lower()
 
+    def test_property_and_fields_share_attr_switch(self):
+        source = """
+class Rectangle:
+    width: int
+    height: int
+
+    def __init__(self, w: int, h: int) -> None:
+        self.width = w
+        self.height = h
+
+    @property
+    def area(self) -> int:
+        return self.width * self.height
+"""
+        result = compile_source(source, "test")
+        attr_start = result.index("static void test_Rectangle_attr(")
+        attr_code = result[attr_start : result.index("\n}\n", attr_start)]
+        assert attr_code.count("switch (attr) {") == 1
+        assert "case MP_QSTR_area:" in attr_code
+        assert "case MP_QSTR_width:" in attr_code
+        assert "attr == MP_QSTR_" not in attr_code
+
     def test_property_with_methods(self):
         source = """
 class Circle:
@@ -2541,11 +2731,60 @@ class Point:
         assert "ARG_y" in result
         # Check print handler for __repr__
         assert "test_Point_print" in result
-        assert 'mp_printf(print, "Point(")' in result
+        assert 'mp_printf(print, "Point(x=%d, y=%d)", (int)self->x, (int)self->y);' in result
         # Check binary_op for __eq__
         assert "test_Point_binary_op" in result
         assert "MP_BINARY_OP_EQUAL" in result
 
+    def test_dataclass_repr_batches_printf_fields(self):
+        source = """
+from dataclasses import dataclass
+
+@dataclass
+class Reading:
+    count: int
+    ok: bool
+    label: str
+    value: int
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert (
+            'mp_printf(print, "Reading(count=%d, ok=%s, label=", '
+            '(int)self->count, self->ok ? "True" : "False");' in result
+        )
+        assert "mp_obj_print_helper(print, self->label, PRINT_REPR);" in result
+        assert 'mp_printf(print, ", value=%d)", (int)self->value);' in result
+
+    def test_dataclass_eq_compares_unboxed_fields_first(self):
+        source = """
+from dataclasses import dataclass
+
+@dataclass
+class Entry:
+    name: str
+    count: int
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert "if (lhs_in == rhs_in) {" in result
+        pod_pos = result.index("lhs->count == rhs->count")
+        obj_pos = result.index("mp_obj_equal(lhs->name, rhs->name)")
+        assert pod_pos < obj_pos
+
+    def test_dataclass_eq_uses_memcmp_for_uniform_int_fields(self):
+        source = """
+from dataclasses import dataclass
+
+@dataclass
+class Rect:
+    x: int
+    y: int
+    w: int
+    h: int
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert "memcmp(&lhs->x, &rhs->x, 4 * sizeof(mp_int_t)) == 0" in result
+        assert "lhs->x == rhs->x" not in result
+
     def test_dataclass_with_defaults(self):
         source = """
 from dataclasses import dataclass
@@ -2601,6 +2840,27 @@ class Dog(Animal):
         assert "MP_QSTR_Animal" in result
         assert "MP_QSTR_Dog" in result
 
+    def test_inherited_vtable_slot_uses_typed_thunk(self):
+        source = """
+class Animal:
+    legs: int
+
+    def walk(self, steps: int) -> int:
+        return steps * self.legs
+
+class Dog(Animal):
+    breed: str
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert (
+            "static mp_int_t test_Dog_walk_thunk(test_Dog_obj_t *self, mp_int_t steps) {"
+            in result
+        )
+        assert "return test_Animal_walk_native((test_Animal_obj_t *)self, steps);" in result
+        assert ".walk = test_Dog_walk_thunk," in result
+        assert ".walk = test_Animal_walk_native," in result
+        assert "(*)(" not in result
+
 
 class TestSuperCalls:
     def test_super_init_basic(self):
@@ -2865,12 +3125,11 @@ class Point:
         result = compile_source(source, "test", type_check=False)
         # Should have attr handler
         assert "test_Point_attr" in result
-        # Should have field descriptor table
-        assert "test_Point_fields" in result
-        assert "MP_QSTR_x" in result
-        assert "MP_QSTR_y" in result
-        # Should have offset calculations
-        assert "offsetof(test_Point_obj_t, x)" in result
+        # Fields are dispatched directly; no descriptor table is emitted
+        assert "test_Point_fields" not in result
+        assert "case MP_QSTR_x:" in result
+        assert "case MP_QSTR_y:" in result
+        assert "self->x" in result
 
     def test_attr_handler_type_dispatch(self):
         source = """
@@ -5789,7 +6048,7 @@ class Pair:
         # Should call user __repr__ (not auto-gen field dump)
         assert "test_Pair___repr___mp(self_in)" in result
         # Should NOT have auto-generated field dump
-        assert 'mp_printf(print, "Pair(")' not in result
+        assert 'mp_printf(print, "Pair(' not in result
 
     def test_dataclass_without_user_repr_keeps_autogen(self):
         """@dataclass without user __repr__ should keep auto-generated print."""
@@ -5804,7 +6063,7 @@ class Vec2:
         result = compile_source(source, "test", type_check=False)
         # Should have auto-generated print handler
         assert "test_Vec2_print" in result
-        assert 'mp_printf(print, "Vec2(")' in result
+        assert 'mp_printf(print, "Vec2(x=%d, y=%d)"' in result
         # Should NOT have user __repr__ call
         assert "__repr___mp" not in result
 
@@ -5933,6 +6192,11 @@ class Number:
         assert "test_Number_binary_op" in result
         assert "MP_BINARY_OP_EQUAL" in result
         assert "test_Number___eq___mp(lhs_in, rhs_in)" in result
+        # A single comparison op is selected without an if-chain
+        assert (
+            "return op == MP_BINARY_OP_EQUAL ? test_Number___eq___mp(lhs_in, rhs_in) : MP_OBJ_NULL;"
+            in result
+        )
 
     def test_multiple_comparison_methods(self):
         """Multiple comparison methods should all be dispatched."""
@@ -6068,6 +6332,75 @@ class Counter:
         assert "iter, test_Counter_iternext" in result
         assert "MP_TYPE_FLAG_ITER_IS_ITERNEXT" in result
 
+    def test_self_contained_next_returns_stop_sentinel(self):
+        """A __next__ with no calls returns the sentinel instead of raising."""
+        source = """
+class Range:
+    current: int
+    end: int
+
+    def __init__(self, end: int) -> None:
+        self.current = 0
+        self.end = end
+
+    def __next__(self) -> int:
+        if self.current >= self.end:
+            raise StopIteration
+        val: int = self.current
+        self.current += 1
+        return val
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert "return MP_OBJ_STOP_ITERATION;" in result
+        assert "mp_raise_msg(&mp_type_StopIteration" not in result
+        iternext = result.split("static mp_obj_t test_Range_iternext")[1].split("\n}\n")[0]
+        assert "return test_Range___next___mp(self_in);" in iternext
+        assert "nlr_push" not in iternext
+
+    def test_next_with_call_keeps_nlr_iternext(self):
+        """A __next__ that calls out may see StopIteration raised elsewhere."""
+        source = """
+class Wrapper:
+    items: list[int]
+    pos: int
+
+    def __init__(self, items: list[int]) -> None:
+        self.items = items
+        self.pos = 0
+
+    def __next__(self) -> int:
+        if self.pos >= len(self.items):
+            raise StopIteration
+        self.pos += 1
+        return self.items[self.pos - 1]
+"""
+        result = compile_source(source, "test", type_check=False)
+        iternext = result.split("static mp_obj_t test_Wrapper_iternext")[1].split("\n}\n")[0]
+        assert "nlr_push" in iternext
+        assert "mp_type_StopIteration" in result
+
+    def test_next_raising_stop_iteration_message_keeps_nlr_iternext(self):
+        """StopIteration("msg") is raised, not lowered, so iternext must catch it."""
+        source = """
+class Range:
+    current: int
+    end: int
+
+    def __init__(self, end: int) -> None:
+        self.current = 0
+        self.end = end
+
+    def __next__(self) -> int:
+        if self.current >= self.end:
+            raise StopIteration("done")
+        self.current += 1
+        return self.current
+"""
+        result = compile_source(source, "test", type_check=False)
+        assert "mp_raise_msg(&mp_type_StopIteration" in result
+        iternext = result.split("static mp_obj_t test_Range_iternext")[1].split("\n}\n")[0]
+        assert "nlr_push" in iternext
+
 
 class TestClassTypedLocalVarAccess:
     """Tests for class-typed local variable attribute access."""
@@ -42,6 +42,7 @@ from mypyc_micropython.ir import (
     NameIR,
     ObjAttrAssignIR,
     PassIR,
+    PropertyInfo,
     ReturnIR,
     SelfMethodCallIR,
     SubscriptAssignIR,
@@ -1493,43 +1494,6 @@ class TestClassEmitterStruct:
         assert "bool enabled;" in struct_code
 
 
-class TestClassEmitterFieldDescriptors:
-    """Tests for field descriptor emission."""
-
-    def test_emit_field_descriptors(self):
-        """Field descriptors for attr lookup."""
-        from mypyc_micropython.class_emitter import ClassEmitter
-
-        class_ir = ClassIR(
-            name="Point",
-            c_name="test_Point",
-            module_name="test",
-            fields=[
-                FieldIR(name="x", py_type="int", c_type=CType.MP_INT_T),
-                FieldIR(name="y", py_type="int", c_type=CType.MP_INT_T),
-            ],
-        )
-        emitter = ClassEmitter(class_ir, "test")
-        desc_code = "\n".join(emitter.emit_field_descriptors())
-        assert "MP_QSTR_x" in desc_code
-        assert "MP_QSTR_y" in desc_code
-        assert "test_Point_field_t" in desc_code
-
-    def test_emit_no_field_descriptors_for_empty_class(self):
-        """No field descriptors for class with no fields."""
-        from mypyc_micropython.class_emitter import ClassEmitter
-
-        class_ir = ClassIR(
-            name="Empty",
-            c_name="test_Empty",
-            module_name="test",
-            fields=[],
-        )
-        emitter = ClassEmitter(class_ir, "test")
-        desc_lines = emitter.emit_field_descriptors()
-        assert desc_lines == []
-
-
 class TestClassEmitterForwardDecl:
     """Tests for forward declaration emission."""
 
@@ -1569,8 +1533,47 @@ class TestClassEmitterAttrHandler:
         assert "qstr attr" in attr_code
         assert "mp_obj_t *dest" in attr_code
 
-    def test_emit_simple_attr_handler_for_empty_class(self):
-        """Simple attribute handler for class with no fields."""
+    def test_emit_attr_handler_switches_on_qstr(self):
+        """Fields are resolved with a specialized switch case per field."""
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        class_ir = ClassIR(
+            name="Point",
+            c_name="test_Point",
+            module_name="test",
+            fields=[
+                FieldIR(name="x", py_type="int", c_type=CType.MP_INT_T),
+                FieldIR(name="y", py_type="float", c_type=CType.MP_FLOAT_T),
+            ],
+        )
+        emitter = ClassEmitter(class_ir, "test")
+        attr_code = "\n".join(emitter.emit_attr_handler())
+        assert "switch (attr) {" in attr_code
+        assert "case MP_QSTR_x:" in attr_code
+        assert "dest[0] = mp_obj_new_int(self->x);" in attr_code
+        assert "self->y = mp_obj_get_float(dest[1]);" in attr_code
+        assert "f->name == attr" not in attr_code
+        assert "switch (f->type)" not in attr_code
+
+    def test_inherited_property_casts_to_owner_struct(self):
+        """Inherited property accessors receive self cast to the defining class."""
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        getter = make_method_ir(name="size", c_name="test_Base_size", return_type=CType.MP_INT_T)
+        getter.is_property = True
+        getter.owner_c_name = "test_Base"
+        base = ClassIR(
+            name="Base",
+            c_name="test_Base",
+            module_name="test",
+            properties={"size": PropertyInfo(name="size", getter=getter)},
+        )
+        child = ClassIR(name="Child", c_name="test_Child", module_name="test", base=base)
+        attr_code = "\n".join(ClassEmitter(child, "test").emit_attr_handler())
+        assert "test_Base_size_native((test_Base_obj_t *)self)" in attr_code
+
+    def test_no_attr_handler_for_class_without_fields_or_properties(self):
+        """A class with nothing to resolve gets neither a handler nor an attr slot."""
         from mypyc_micropython.class_emitter import ClassEmitter
 
         class_ir = ClassIR(
@@ -1580,10 +1583,99 @@ class TestClassEmitterAttrHandler:
             fields=[],
         )
         emitter = ClassEmitter(class_ir, "test")
-        attr_code = "\n".join(emitter.emit_attr_handler())
-        assert "test_Empty_attr" in attr_code
-        # Simple handler just delegates
-        assert "dest[1] = MP_OBJ_SENTINEL" in attr_code
+        assert emitter.emit_attr_handler() == []
+        assert "attr," not in "\n".join(emitter.emit_type_definition())
+
+
+class TestClassEmitterVtable:
+    """Tests for vtable instance emission."""
+
+    def test_inherited_method_gets_thunk_when_child_name_prefixes_base(self):
+        """Ownership comes from owner_c_name, not a C name prefix match."""
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        get = make_method_ir(name="get", c_name="m_A_B_get", return_type=CType.MP_INT_T)
+        get.owner_c_name = "m_A_B"
+        base = ClassIR(
+            name="A_B",
+            c_name="m_A_B",
+            module_name="m",
+            methods={"get": get},
+            virtual_methods=["get"],
+        )
+        child = ClassIR(name="A", c_name="m_A", module_name="m", base=base)
+        vtable_code = "\n".join(ClassEmitter(child, "m").emit_vtable_instance())
+        assert "static mp_int_t m_A_get_thunk(m_A_obj_t *self) {" in vtable_code
+        assert "return m_A_B_get_native((m_A_B_obj_t *)self);" in vtable_code
+        assert ".get = m_A_get_thunk," in vtable_code
+        assert ".get = m_A_B_get_native," not in vtable_code
+
+    def test_own_method_without_owner_uses_native_directly(self):
+        """Hand-built overrides without owner_c_name still resolve to this class."""
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        base_get = make_method_ir(name="get", c_name="m_Base_get", return_type=CType.MP_INT_T)
+        base = ClassIR(
+            name="Base",
+            c_name="m_Base",
+            module_name="m",
+            methods={"get": base_get},
+            virtual_methods=["get"],
+        )
+        own_get = make_method_ir(name="get", c_name="m_Child_get", return_type=CType.MP_INT_T)
+        child = ClassIR(
+            name="Child",
+            c_name="m_Child",
+            module_name="m",
+            base=base,
+            methods={"get": own_get},
+            virtual_methods=["get"],
+        )
+        vtable_code = "\n".join(ClassEmitter(child, "m").emit_vtable_instance())
+        assert ".get = m_Child_get_native," in vtable_code
+        assert "_thunk" not in vtable_code
+
+
+class TestClassEmitterCache:
+    """Tests for the on-disk class fragment cache."""
+
+    def _make_point(self) -> ClassIR:
+        return ClassIR(
+            name="Point",
+            c_name="test_Point",
+            module_name="test",
+            fields=[FieldIR(name="x", py_type="int", c_type=CType.MP_INT_T)],
+        )
+
+    def test_emit_all_populates_cache(self, tmp_path):
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        code = ClassEmitter(self._make_point(), "test").emit_all(tmp_path)
+        fragments = list(tmp_path.glob("*.cfrag"))
+        assert len(fragments) == 1
+        assert fragments[0].read_text() == code
+        assert code == ClassEmitter(self._make_point(), "test").emit_all()
+
+    def test_emit_all_reuses_cached_fragment(self, tmp_path):
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        ClassEmitter(self._make_point(), "test").emit_all(tmp_path)
+        (fragment,) = tmp_path.glob("*.cfrag")
+        fragment.write_text("/* cached */")
+        assert ClassEmitter(self._make_point(), "test").emit_all(tmp_path) == "/* cached */"
+
+        changed = self._make_point()
+        changed.fields.append(FieldIR(name="y", py_type="int", c_type=CType.MP_INT_T))
+        assert "MP_QSTR_y" in ClassEmitter(changed, "test").emit_all(tmp_path)
+
+    def test_body_and_full_emit_use_separate_fragments(self, tmp_path):
+        from mypyc_micropython.class_emitter import ClassEmitter
+
+        body = ClassEmitter(self._make_point(), "test").emit_all_except_struct(tmp_path)
+        full = ClassEmitter(self._make_point(), "test").emit_all(tmp_path)
+        assert len(list(tmp_path.glob("*.cfrag"))) == 2
+        assert body == ClassEmitter(self._make_point(), "test").emit_all_except_struct()
+        assert full != body
 
 
 class TestClassEmitterTypeDefinition:
@@ -7,11 +7,28 @@ import pytest
 from mypyc_micropython.type_checker import (
     TypeCheckResult,
     format_type_errors,
+    type_check_file,
     type_check_package,
     type_check_source,
 )
 
 
+@pytest.fixture
+def mypy_runs(monkeypatch):
+    """Record each real mypy run behind the cached type_check_* wrappers."""
+    from mypyc_micropython import type_checker
+
+    calls = []
+    run_type_check = type_checker._run_type_check
+
+    def counting_run(*args):
+        calls.append(args)
+        return run_type_check(*args)
+
+    monkeypatch.setattr(type_checker, "_run_type_check", counting_run)
+    return calls
+
+
 class TestTypeCheckSource:
     def test_valid_function(self):
         source = """
@@ -149,6 +166,41 @@ class Dog(Animal):
         assert "Dog" in result.classes
         assert result.classes["Dog"].base_class == "Animal"
 
+    def test_repeated_source_reuses_result(self, mypy_runs):
+        source = """
+def add(a: int, b: int) -> int:
+    return a + b
+"""
+        first = type_check_source(source, "cached")
+        assert type_check_source(source, "cached") == first
+        assert len(mypy_runs) == 1
+        type_check_source(source, "cached", strict=True)
+        assert len(mypy_runs) == 2
+
+    def test_cached_result_is_not_shared(self):
+        source = 'x: int = "a"\n'
+        first = type_check_source(source, "shared")
+        assert not first.success
+        first.errors.append("mine")
+        first.success = True
+
+        second = type_check_source(source, "shared")
+        assert not second.success
+        assert "mine" not in second.errors
+
+    def test_file_result_tracks_content(self, tmp_path, mypy_runs):
+        path = tmp_path / "mod.py"
+        path.write_text("def f() -> int:\n    return 1\n")
+        first = type_check_file(path)
+        assert first.success
+        assert type_check_file(path) == first
+        assert len(mypy_runs) == 1
+
+        path.write_text("def f() -> int:\n    return 'x'\n")
+        second = type_check_file(path)
+        assert not second.success
+        assert len(mypy_runs) == 2
+
 
 class TestFormatTypeErrors:
     def test_format_no_errors(self):